@@ -0,0 +1 @@
+"""Benchmarks of the Switcher integration, run against local fake devices."""
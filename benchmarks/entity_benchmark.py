@@ -0,0 +1,307 @@
+"""In-process benchmark of the entity reconciliation and dispatch pipeline.
+
+Measures ``EntityManager.create_components``, ``EntityManager.async_update``,
+``EntityManager.get_schedule_switch`` and ``HomeAssistantManager.dispatch_all``
+with a stubbed ``hass`` and entity registry and synthetic device data, for a
+device with 1, 50 and 500 entities, including memory allocated per cycle.
+
+Usage (from the repository root, Home Assistant and aioswitcher installed):
+
+    python -m benchmarks.entity_benchmark --entities 1 50 500 --rounds 200
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID, CONF_IP_ADDRESS
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.switcher_api.api.switcher_api import SwitcherApi
+from custom_components.switcher_api.helpers.const import *
+from custom_components.switcher_api.managers.device_manager import DeviceManager
+from custom_components.switcher_api.managers.entity_manager import EntityManager
+from custom_components.switcher_api.managers.home_assistant import (
+    HomeAssistantManager,
+)
+from custom_components.switcher_api.models.state_data import StateData
+from custom_components.switcher_api.sensor import get_sensor
+from custom_components.switcher_api.switch import get_switch
+
+DEFAULT_ENTITIES = [1, 50, 500]
+DEFAULT_ROUNDS = 200
+BASE_ENTITIES = 3
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+
+
+class StubBus:
+    def async_listen(self, event_type, listener):
+        return lambda: None
+
+
+class StubStates:
+    def get(self, entity_id):
+        return None
+
+
+class StubHass:
+    """Just enough of Home Assistant for the managers and the dispatcher."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {}
+        self.bus = StubBus()
+        self.states = StubStates()
+
+    def async_add_hass_job(self, hass_job, *args):
+        hass_job.target(*args)
+
+    def async_create_task(self, target):
+        return self.loop.create_task(target)
+
+
+class StubEntityRegistry:
+    def async_get_entity_id(self, domain, platform, unique_id):
+        return None
+
+    def async_get(self, entity_id):
+        return None
+
+    def async_remove(self, entity_id):
+        pass
+
+
+class StubStorageManager:
+    def get(self, entry_id):
+        return None
+
+    def update(self, entry_id, state, schedules):
+        pass
+
+
+def create_state(is_on: bool) -> StateData:
+    state = StateData(
+        state="ON" if is_on else "OFF",
+        time_left="00:45:00" if is_on else "00:00:00",
+        time_on="00:15:00" if is_on else "00:00:00",
+        auto_shutdown="01:30:00",
+        power_consumption=2600 if is_on else 0,
+        electric_current=11.8 if is_on else 0.0,
+    )
+
+    return state
+
+
+def create_schedules(count: int, version: int = 0) -> dict:
+    schedules = []
+
+    for index in range(count):
+        hour = (index + version) % 24
+
+        schedules.append(
+            {
+                KEY_SCHEDULE_ID: str(index),
+                KEY_RECURRING: True,
+                KEY_DAYS: DAYS,
+                KEY_START_TIME: f"{hour:02d}:00",
+                KEY_END_TIME: f"{hour:02d}:30",
+                "duration": "0:30:00",
+                "display": f"Due next Monday at {hour:02d}:00",
+            }
+        )
+
+    return {KEY_FOUND_SCHEDULES: count > 0, KEY_SCHEDULES: schedules}
+
+
+async def async_create_manager(hass: StubHass, schedules: int) -> HomeAssistantManager:
+    ha = HomeAssistantManager(hass)
+
+    data = {CONF_IP_ADDRESS: "127.0.0.2", CONF_DEVICE_ID: "000001"}
+    entry = ConfigEntry(1, DOMAIN, "Boiler", data, "user", "local_poll", {})
+
+    await ha.config_manager.update(entry)
+
+    ha._api = SwitcherApi(hass, ha.config_manager)
+    ha._entity_manager = EntityManager(hass, ha)
+    ha._device_manager = DeviceManager(hass, ha)
+    ha._entity_registry = StubEntityRegistry()
+    ha._is_initialized = True
+
+    hass.data[DATA] = {entry.entry_id: ha, DATA_STORAGE: StubStorageManager()}
+
+    ha.api.state = create_state(False)
+    ha.api.schedules = create_schedules(schedules)
+
+    entity_manager = ha.entity_manager
+
+    def async_add_entities(entities, update_before_add=False):
+        for entity in entities:
+            signal = UPDATE_SIGNAL.format(entry.entry_id, entity.unique_id)
+
+            async_dispatcher_connect(hass, signal, lambda data: None)
+
+    entity_manager.set_domain_component(DOMAIN_SWITCH, async_add_entities, get_switch)
+    entity_manager.set_domain_component(DOMAIN_SENSOR, async_add_entities, get_sensor)
+
+    ha.device_manager.update()
+    await entity_manager.async_update()
+    ha.dispatch_all()
+
+    return ha
+
+
+class Measurement:
+    name: str
+    entities: int
+    durations: List[float]
+    peak_memory: int
+    retained_blocks: int
+    gc_collections: int
+
+    def __init__(self, name: str, entities: int):
+        self.name = name
+        self.entities = entities
+        self.durations = []
+        self.peak_memory = 0
+        self.retained_blocks = 0
+        self.gc_collections = 0
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'stage':<28}{'entities':>9}{'mean us':>10}{'p95 us':>10}"
+            f"{'peak KiB':>10}{'blocks/cycle':>14}{'gen0 GCs':>10}"
+        )
+
+    def __repr__(self):
+        rounds = len(self.durations)
+        ordered = sorted(self.durations)
+        mean = sum(ordered) / rounds * 1000000
+        p95 = ordered[round(0.95 * (rounds - 1))] * 1000000
+
+        return (
+            f"{self.name:<28}{self.entities:>9}{mean:>10.1f}{p95:>10.1f}"
+            f"{self.peak_memory / 1024:>10.1f}{self.retained_blocks / rounds:>14.2f}"
+            f"{self.gc_collections:>10}"
+        )
+
+
+async def async_measure(
+    name: str, entities: int, rounds: int, cycle: Callable
+) -> Measurement:
+    """Time every round, then repeat all rounds under tracemalloc for allocations."""
+    measurement = Measurement(name, entities)
+
+    await cycle()
+
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await cycle()
+        measurement.durations.append(time.perf_counter() - started)
+
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+
+    for _ in range(rounds):
+        await cycle()
+
+    measurement.peak_memory = tracemalloc.get_traced_memory()[1]
+
+    retained = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    measurement.retained_blocks = sum(stat.count_diff for stat in retained)
+
+    tracemalloc.stop()
+
+    measurement.gc_collections = gc.get_stats()[0]["collections"] - collections
+
+    return measurement
+
+
+async def async_benchmark(target_entities: int, rounds: int) -> List[Measurement]:
+    hass = StubHass(asyncio.get_event_loop())
+
+    schedules = max(target_entities - BASE_ENTITIES, 0)
+    ha = await async_create_manager(hass, schedules)
+
+    api = ha.api
+    entity_manager = ha.entity_manager
+    entities = len(entity_manager.get_all_entities())
+    schedule = api.schedules[KEY_SCHEDULES][0] if schedules > 0 else None
+
+    async def create_components():
+        entity_manager.create_components()
+        entity_manager.changed_entities.clear()
+
+    async def reconcile_unchanged():
+        await entity_manager.async_update()
+        ha.dispatch_all()
+
+    async def reconcile_state_changed():
+        api.state = create_state(not api.is_on)
+
+        await entity_manager.async_update()
+        ha.dispatch_all()
+
+    async def reconcile_all_changed():
+        api.state = create_state(not api.is_on)
+        api.schedules = create_schedules(schedules, int(api.is_on))
+
+        await entity_manager.async_update()
+        ha.dispatch_all()
+
+    async def get_schedule_switch():
+        entity_manager.get_schedule_switch(schedule)
+
+    async def dispatch_all():
+        for entity in entity_manager.get_all_entities():
+            entity_manager.changed_entities[entity.unique_id] = entity
+
+        ha.dispatch_all()
+
+    stages = [
+        ("create_components", create_components),
+        ("async_update (unchanged)", reconcile_unchanged),
+        ("async_update (state)", reconcile_state_changed),
+        ("async_update (all)", reconcile_all_changed),
+        ("dispatch_all (all)", dispatch_all),
+    ]
+
+    if schedule is not None:
+        stages.append(("get_schedule_switch", get_schedule_switch))
+
+    measurements = []
+
+    for name, cycle in stages:
+        measurements.append(await async_measure(name, entities, rounds, cycle))
+
+    entity_manager.async_remove()
+
+    return measurements
+
+
+async def async_main(args):
+    print(Measurement.header())
+
+    for target_entities in args.entities:
+        for measurement in await async_benchmark(target_entities, args.rounds):
+            print(measurement)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, nargs="+", default=DEFAULT_ENTITIES)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+
+    args = parser.parse_args()
+
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()
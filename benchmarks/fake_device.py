@@ -0,0 +1,490 @@
+"""Local stand-in for Switcher devices, speaking the TCP API and the UDP broadcast.
+
+Each device listens on its own loopback address, the TCP port is the one used
+by aioswitcher (9957), so ``SwitcherApi`` can reach it without changes.
+
+Run as a module to serve a fleet from its own process (keeping its CPU time
+out of the measured process), the device list is written to stdout as JSON,
+then every ``stats`` line on stdin is answered with the traffic counters,
+``stop`` (or end of input) stops the fleet:
+
+    python -m benchmarks.fake_device --devices 10 --latency 0.02 --broadcast
+"""
+import argparse
+import asyncio
+from datetime import datetime
+import json
+import logging
+import random
+from socket import AF_INET, inet_aton
+import struct
+import sys
+import time
+from typing import Dict, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+SWITCHER_TCP_PORT = 9957
+SWITCHER_BROADCAST_PORT = 20002
+
+HEADER = b"\xfe\xf0"
+HEADER_LENGTH = 4
+CRC_LENGTH = 4
+DEVICE_ID_OFFSET = 40
+DEVICE_TYPE_V2_ESP = "a7"
+
+REQUEST_LOGIN = "login"
+REQUEST_STATE = "get_state"
+REQUEST_CONTROL = "control"
+REQUEST_AUTO_SHUTDOWN = "set_auto_shutdown"
+REQUEST_DEVICE_NAME = "set_device_name"
+REQUEST_SCHEDULES = "get_schedules"
+REQUEST_DELETE_SCHEDULE = "delete_schedule"
+REQUEST_CREATE_SCHEDULE = "create_schedule"
+
+# Request packets are identified by their length (bytes 2-3 of the header)
+REQUEST_TYPES = {
+    82: REQUEST_LOGIN,
+    48: REQUEST_STATE,
+    93: REQUEST_CONTROL,
+    91: REQUEST_AUTO_SHUTDOWN,
+    116: REQUEST_DEVICE_NAME,
+    87: REQUEST_SCHEDULES,
+    88: REQUEST_DELETE_SCHEDULE,
+    99: REQUEST_CREATE_SCHEDULE,
+}
+
+STATE_RESPONSE_LENGTH = 105
+SCHEDULE_RECORD_LENGTH = 16
+SCHEDULES_OFFSET = 45
+BROADCAST_LENGTH = 165
+WATTS_WHILE_ON = 2600
+
+
+def _to_uint32(value: int) -> bytes:
+    return struct.pack("<I", value)
+
+
+def _from_uint32(data: bytes) -> int:
+    return struct.unpack("<I", data)[0]
+
+
+class FakeDeviceOptions:
+    """Network conditions simulated by a fake device."""
+
+    latency: float
+    jitter: float
+    packet_loss: float
+    single_connection: bool
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        packet_loss: float = 0.0,
+        single_connection: bool = False,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.packet_loss = packet_loss
+        self.single_connection = single_connection
+
+
+class FakeSchedule:
+    schedule_id: int
+    enabled: bool
+    days: int
+    start_time: int
+    end_time: int
+
+    def __init__(self, schedule_id: int, days: int, start_time: int, end_time: int):
+        self.schedule_id = schedule_id
+        self.enabled = True
+        self.days = days
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def to_bytes(self) -> bytes:
+        record = bytes([self.schedule_id, int(self.enabled), self.days, 1])
+        record += _to_uint32(self.start_time) + _to_uint32(self.end_time)
+
+        return record.ljust(SCHEDULE_RECORD_LENGTH, b"\x00")
+
+
+class FakeSwitcherDevice:
+    """Single water heater, keeps its state and counts the traffic it served."""
+
+    device_id: str
+    ip_address: str
+    name: str
+    options: FakeDeviceOptions
+    is_on: bool
+    power_consumption: int
+    turned_on: Optional[datetime]
+    timer: int
+    auto_shutdown: int
+    schedules: Dict[int, FakeSchedule]
+    connections: int
+    rejected_connections: int
+    dropped_requests: int
+    requests: Dict[str, int]
+
+    def __init__(self, device_id: str, ip_address: str, options: FakeDeviceOptions):
+        self.device_id = device_id
+        self.ip_address = ip_address
+        self.name = f"Switcher {device_id}"
+        self.options = options
+
+        self.is_on = False
+        self.power_consumption = 0
+        self.turned_on = None
+        self.timer = 0
+        self.auto_shutdown = 3600
+        self.schedules = {}
+
+        self.connections = 0
+        self.rejected_connections = 0
+        self.dropped_requests = 0
+        self.requests = {request_type: 0 for request_type in REQUEST_TYPES.values()}
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._active_connections = 0
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.requests.values())
+
+    @property
+    def time_on(self) -> int:
+        if self.turned_on is None:
+            return 0
+
+        return int((datetime.utcnow() - self.turned_on).total_seconds())
+
+    @property
+    def time_left(self) -> int:
+        if not self.is_on:
+            return 0
+
+        limit = self.timer if self.timer > 0 else self.auto_shutdown
+
+        return max(limit - self.time_on, 0)
+
+    async def async_start(self, port: int = SWITCHER_TCP_PORT):
+        self._server = await asyncio.start_server(
+            self._handle_connection, host=self.ip_address, port=port, family=AF_INET
+        )
+
+    async def async_stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+            self._server = None
+
+    def set_state(self, is_on: bool, timer: int = 0):
+        self.is_on = is_on
+        self.power_consumption = WATTS_WHILE_ON if is_on else 0
+        self.turned_on = datetime.utcnow() if is_on else None
+        self.timer = timer if is_on else 0
+
+    def add_schedule(self, days: int, start_time: int, end_time: int) -> int:
+        schedule_id = 0
+
+        while schedule_id in self.schedules:
+            schedule_id += 1
+
+        self.schedules[schedule_id] = FakeSchedule(
+            schedule_id, days, start_time, end_time
+        )
+
+        return schedule_id
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self.connections += 1
+
+        if self.options.single_connection and self._active_connections > 0:
+            self.rejected_connections += 1
+
+            writer.close()
+            return
+
+        self._active_connections += 1
+
+        try:
+            while True:
+                header = await reader.readexactly(HEADER_LENGTH)
+
+                if header[0:2] != HEADER:
+                    break
+
+                length = struct.unpack("<H", header[2:4])[0]
+                body = await reader.readexactly(length - HEADER_LENGTH)
+
+                response = await self._async_handle_request(header + body)
+
+                if response is not None:
+                    writer.write(response)
+                    await writer.drain()
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            self._active_connections -= 1
+
+            writer.close()
+
+    async def _async_handle_request(self, packet: bytes) -> Optional[bytes]:
+        request_type = REQUEST_TYPES.get(len(packet))
+
+        if request_type is None:
+            _LOGGER.warning(f"Unknown request of {len(packet)} bytes")
+            return None
+
+        self.requests[request_type] += 1
+
+        options = self.options
+        delay = options.latency + random.uniform(0, options.jitter)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if random.random() < options.packet_loss:
+            self.dropped_requests += 1
+            return None
+
+        payload = packet[:-CRC_LENGTH]
+
+        if request_type == REQUEST_LOGIN:
+            response = self._build_login_response()
+
+        elif request_type == REQUEST_STATE:
+            response = self._build_state_response()
+
+        elif request_type == REQUEST_SCHEDULES:
+            response = self._build_schedules_response()
+
+        else:
+            self._apply_request(request_type, payload)
+
+            response = self._build_ack_response()
+
+        return response
+
+    def _apply_request(self, request_type: str, payload: bytes):
+        if request_type == REQUEST_CONTROL:
+            # "0106000{command}00{timer}"
+            is_on = payload[-6] == 1
+            self.set_state(is_on, _from_uint32(payload[-4:]))
+
+        elif request_type == REQUEST_AUTO_SHUTDOWN:
+            self.auto_shutdown = _from_uint32(payload[-4:])
+
+        elif request_type == REQUEST_DEVICE_NAME:
+            self.name = payload[-32:].rstrip(b"\x00").decode()
+
+        elif request_type == REQUEST_DELETE_SCHEDULE:
+            self.schedules.pop(payload[-1], None)
+
+        elif request_type == REQUEST_CREATE_SCHEDULE:
+            # "01{weekdays}01{start}{end}"
+            days = payload[-10]
+            start_time = _from_uint32(payload[-8:-4])
+            end_time = _from_uint32(payload[-4:])
+
+            self.add_schedule(days, start_time, end_time)
+
+    def _build_login_response(self) -> bytes:
+        session_id = random.getrandbits(32).to_bytes(4, "little")
+
+        return (HEADER + bytes(6) + session_id).ljust(32, b"\x00")
+
+    def _build_ack_response(self) -> bytes:
+        return (HEADER + bytes(2)).ljust(32, b"\x00")
+
+    def _build_state_response(self) -> bytes:
+        response = bytearray(STATE_RESPONSE_LENGTH)
+
+        response[0:2] = HEADER
+        response[75:77] = b"\x01\x00" if self.is_on else b"\x00\x00"
+        response[77:79] = struct.pack("<H", self.power_consumption)
+        response[89:93] = _to_uint32(self.time_left)
+        response[93:97] = _to_uint32(self.time_on)
+        response[97:101] = _to_uint32(self.auto_shutdown)
+
+        return bytes(response)
+
+    def _build_schedules_response(self) -> bytes:
+        response = bytearray(SCHEDULES_OFFSET)
+        response[0:2] = HEADER
+
+        for schedule_id in sorted(self.schedules):
+            response += self.schedules[schedule_id].to_bytes()
+
+        return bytes(response + bytes(CRC_LENGTH))
+
+    def build_broadcast(self) -> bytes:
+        message = bytearray(BROADCAST_LENGTH)
+
+        message[0:2] = HEADER
+        message[18:21] = bytes.fromhex(self.device_id)
+        message[42:74] = self.name.encode()[:32].ljust(32, b"\x00")
+        message[75] = int(DEVICE_TYPE_V2_ESP, 16)
+        message[76:80] = inet_aton(self.ip_address)
+        message[133:135] = b"\x01\x00" if self.is_on else b"\x00\x00"
+        message[135:137] = struct.pack("<H", self.power_consumption)
+        message[147:151] = _to_uint32(self.time_left)
+        message[155:159] = _to_uint32(self.auto_shutdown)
+
+        return bytes(message)
+
+
+class FakeDeviceFleet:
+    """Set of fake devices, each one bound to its own loopback address."""
+
+    devices: List[FakeSwitcherDevice]
+
+    def __init__(self, count: int, options: FakeDeviceOptions, schedules: int = 0):
+        self.devices = []
+
+        self._broadcast_task: Optional[asyncio.Task] = None
+        self._broadcast_transport = None
+
+        for index in range(count):
+            device = FakeSwitcherDevice(
+                f"{index + 1:06x}", f"127.0.{index // 250}.{(index % 250) + 2}", options
+            )
+
+            for schedule_index in range(schedules):
+                start_time = 1609459200 + (schedule_index * 3600)
+                device.add_schedule(0x3E, start_time, start_time + 1800)
+
+            self.devices.append(device)
+
+    @property
+    def connections(self) -> int:
+        return sum(device.connections for device in self.devices)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(device.round_trips for device in self.devices)
+
+    def get_requests(self, request_type: str) -> int:
+        return sum(device.requests[request_type] for device in self.devices)
+
+    async def async_start(self):
+        await asyncio.gather(*[device.async_start() for device in self.devices])
+
+    async def async_stop(self):
+        self.stop_broadcast()
+
+        await asyncio.gather(*[device.async_stop() for device in self.devices])
+
+    async def async_start_broadcast(
+        self, interval: float = 4.0, port: int = SWITCHER_BROADCAST_PORT
+    ):
+        """Send the status datagram of every device periodically, as the devices do."""
+        loop = asyncio.get_event_loop()
+
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=("127.0.0.1", port), family=AF_INET
+        )
+
+        self._broadcast_transport = transport
+        self._broadcast_task = loop.create_task(self._async_broadcast(interval))
+
+    def stop_broadcast(self):
+        if self._broadcast_task is not None:
+            self._broadcast_task.cancel()
+            self._broadcast_task = None
+
+        if self._broadcast_transport is not None:
+            self._broadcast_transport.close()
+            self._broadcast_transport = None
+
+    async def _async_broadcast(self, interval: float):
+        while True:
+            for device in self.devices:
+                self._broadcast_transport.sendto(device.build_broadcast())
+
+            await asyncio.sleep(interval)
+
+
+def get_fleet_stats(fleet: FakeDeviceFleet) -> dict:
+    stats = {
+        "round_trips": fleet.round_trips,
+        "connections": fleet.connections,
+        "requests": {
+            request_type: fleet.get_requests(request_type)
+            for request_type in REQUEST_TYPES.values()
+        },
+        "cpu_time": time.process_time(),
+    }
+
+    return stats
+
+
+def write_line(obj: dict):
+    sys.stdout.write(f"{json.dumps(obj)}\n")
+    sys.stdout.flush()
+
+
+async def async_main(args):
+    options = FakeDeviceOptions(
+        args.latency, args.jitter, args.loss, args.single_connection
+    )
+
+    fleet = FakeDeviceFleet(args.devices, options, args.schedules)
+
+    await fleet.async_start()
+
+    if args.broadcast:
+        await fleet.async_start_broadcast()
+
+    devices = [
+        {
+            "device_id": device.device_id,
+            "ip_address": device.ip_address,
+            "name": device.name,
+        }
+        for device in fleet.devices
+    ]
+
+    write_line({"devices": devices})
+
+    loop = asyncio.get_event_loop()
+
+    try:
+        while True:
+            command = (await loop.run_in_executor(None, sys.stdin.readline)).strip()
+
+            if command == "stats":
+                write_line(get_fleet_stats(fleet))
+
+            elif command in ["stop", ""]:
+                break
+
+    finally:
+        await fleet.async_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--schedules", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="0 to 1")
+    parser.add_argument("--single-connection", action="store_true")
+    parser.add_argument("--broadcast", action="store_true")
+
+    args = parser.parse_args()
+
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()
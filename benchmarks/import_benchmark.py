@@ -0,0 +1,160 @@
+"""Import-time benchmark of the integration modules on top of Home Assistant.
+
+Runs ``python -X importtime`` in a fresh interpreter for every target module,
+after importing the modules Home Assistant has loaded anyway by the time the
+integration is set up, so only the cost added by the integration (its own
+modules and dependencies such as aioswitcher) is counted. The median of all
+runs is compared against a threshold, the exit code is non-zero once it is
+exceeded.
+
+Usage (from the repository root, Home Assistant and aioswitcher installed):
+
+    python -m benchmarks.import_benchmark --runs 5 --threshold 150
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple
+
+DEFAULT_RUNS = 5
+DEFAULT_THRESHOLD = 150
+DEFAULT_TOP = 10
+
+PACKAGE = "custom_components.switcher_api"
+
+DEFAULT_MODULES = [
+    PACKAGE,
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.switch",
+    f"{PACKAGE}.config_flow",
+]
+
+# Loaded by Home Assistant before any integration is set up
+DEFAULT_BASELINE = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.dispatcher",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.components.sensor",
+    "homeassistant.components.switch",
+]
+
+MARKER = "import-benchmark-start"
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_time: int
+    cumulative_time: int
+
+
+def run_import(module: str, baseline: List[str]) -> List[ImportRecord]:
+    """Import a module in a new interpreter, return the imports made after the baseline."""
+    code = "; ".join(
+        [f"import {name}" for name in baseline]
+        + ["import sys", f"sys.stderr.write('{MARKER}\\n')", f"import {module}"]
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr}")
+
+    lines = result.stderr.splitlines()
+    records = []
+
+    for line in lines[lines.index(MARKER) + 1 :]:
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+
+        records.append(
+            ImportRecord(name.strip(), int(self_time), int(cumulative_time))
+        )
+
+    return records
+
+
+class ModuleResult:
+    module: str
+    totals: List[int]
+    self_times: Dict[str, List[int]]
+
+    def __init__(self, module: str):
+        self.module = module
+        self.totals = []
+        self.self_times = {}
+
+    @property
+    def median(self) -> float:
+        """Median import time in milliseconds."""
+        return statistics.median(self.totals) / 1000
+
+    def add(self, records: List[ImportRecord]):
+        self.totals.append(sum(record.self_time for record in records))
+
+        for record in records:
+            self.self_times.setdefault(record.module, []).append(record.self_time)
+
+    def get_top(self, count: int) -> List[str]:
+        medians = {
+            module: statistics.median(self.self_times[module])
+            for module in self.self_times
+        }
+
+        ordered = sorted(medians, key=lambda module: medians[module], reverse=True)
+
+        top = [
+            f"{module} {medians[module] / 1000:.1f} ms" for module in ordered[:count]
+        ]
+
+        return top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--baseline", nargs="*", default=DEFAULT_BASELINE)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="milliseconds"
+    )
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+
+    args = parser.parse_args()
+
+    exceeded = []
+
+    for module in args.modules:
+        result = ModuleResult(module)
+
+        for _ in range(args.runs):
+            result.add(run_import(module, args.baseline))
+
+        print(f"{module}: {result.median:.1f} ms (median of {args.runs} runs)")
+
+        for line in result.get_top(args.top):
+            print(f"    {line}")
+
+        if result.median > args.threshold:
+            exceeded.append(module)
+
+    if len(exceeded) > 0:
+        print(f"Import time above {args.threshold} ms: {', '.join(exceeded)}")
+
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
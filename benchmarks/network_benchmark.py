@@ -0,0 +1,385 @@
+"""Network benchmark of the integration against local fake Switcher devices.
+
+Drives ``SwitcherApi`` directly (api scenario) and the full integration through
+``HomeAssistantManager`` (manager scenario) against 1, 10 and 100 fake devices,
+reports round trips per cycle, p95 latency, sockets opened and CPU per poll.
+The devices are served from a separate process, so the CPU time measured is
+the one of Home Assistant and the integration only.
+
+Usage (from the repository root, Home Assistant and aioswitcher installed):
+
+    python -m benchmarks.network_benchmark --latency 0.02 --jitter 0.01
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List, NamedTuple, Optional
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID, CONF_IP_ADDRESS, EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry, device_registry, entity_registry
+from homeassistant.setup import async_setup_component
+
+from custom_components.switcher_api.api.switcher_api import SwitcherApi
+from custom_components.switcher_api.helpers.const import *
+from custom_components.switcher_api.managers.configuration_manager import (
+    ConfigManager,
+)
+
+from .fake_device import REQUEST_STATE
+
+_LOGGER = logging.getLogger(__name__)
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_DEVICES = [1, 10, 100]
+DEFAULT_CYCLES = 10
+DEFAULT_DURATION = 30
+DEFAULT_POLL_TIMEOUT = 15
+
+
+def percentile(values: List[float], percent: int) -> Optional[float]:
+    if len(values) == 0:
+        return None
+
+    ordered = sorted(values)
+    index = round((percent / 100) * (len(ordered) - 1))
+
+    return ordered[index]
+
+
+class FakeDeviceInfo(NamedTuple):
+    device_id: str
+    ip_address: str
+    name: str
+
+
+class FleetProcess:
+    """Fake devices served by ``benchmarks.fake_device`` in a child process."""
+
+    devices: List[FakeDeviceInfo]
+
+    def __init__(self, count: int, args):
+        self.devices = []
+
+        self._count = count
+        self._args = args
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._stats = {}
+
+    @property
+    def round_trips(self) -> int:
+        return self._stats["round_trips"]
+
+    @property
+    def connections(self) -> int:
+        return self._stats["connections"]
+
+    def get_requests(self, request_type: str) -> int:
+        return self._stats["requests"][request_type]
+
+    async def async_start(self):
+        args = self._args
+
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_device",
+            "--devices",
+            str(self._count),
+            "--schedules",
+            str(args.schedules),
+            "--latency",
+            str(args.latency),
+            "--jitter",
+            str(args.jitter),
+            "--loss",
+            str(args.loss),
+        ]
+
+        if args.single_connection:
+            command.append("--single-connection")
+
+        if args.broadcast:
+            command.append("--broadcast")
+
+        self._process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=REPOSITORY_PATH,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+
+        started = await self._async_read()
+
+        self.devices = [FakeDeviceInfo(**device) for device in started["devices"]]
+
+    async def async_update_stats(self):
+        """Fetch the traffic counters of the fleet, read by the properties."""
+        self._process.stdin.write(b"stats\n")
+        await self._process.stdin.drain()
+
+        self._stats = await self._async_read()
+
+    async def async_stop(self):
+        if self._process is not None:
+            self._process.stdin.write(b"stop\n")
+            await self._process.stdin.drain()
+            await self._process.wait()
+
+            self._process = None
+
+    async def _async_read(self) -> dict:
+        line = await self._process.stdout.readline()
+
+        return json.loads(line)
+
+
+def create_entry(device, options: dict) -> ConfigEntry:
+    data = {CONF_IP_ADDRESS: device.ip_address, CONF_DEVICE_ID: device.device_id}
+
+    entry = ConfigEntry(1, DOMAIN, device.name, data, "user", options=options)
+
+    return entry
+
+
+class BenchmarkResult:
+    scenario: str
+    devices: int
+    polls: int
+    round_trips: int
+    sockets: int
+    cpu_time: float
+    wall_time: float
+    latencies: List[float]
+    timeouts: int
+    state_writes: int
+
+    def __init__(self, scenario: str, devices: int):
+        self.scenario = scenario
+        self.devices = devices
+        self.polls = 0
+        self.round_trips = 0
+        self.sockets = 0
+        self.cpu_time = 0
+        self.wall_time = 0
+        self.latencies = []
+        self.timeouts = 0
+        self.state_writes = 0
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'scenario':<10}{'devices':>8}{'polls':>8}{'rtt/cycle':>11}"
+            f"{'p95 ms':>9}{'sockets':>9}{'cpu/poll ms':>13}{'timeouts':>10}"
+            f"{'writes':>8}"
+        )
+
+    def __repr__(self):
+        cycles = self.polls / self.devices if self.devices > 0 else 0
+        round_trips = self.round_trips / cycles if cycles > 0 else 0
+        latency = percentile(self.latencies, 95)
+        latency = "-" if latency is None else f"{latency * 1000:.1f}"
+        cpu_per_poll = self.cpu_time / self.polls * 1000 if self.polls > 0 else 0
+
+        return (
+            f"{self.scenario:<10}{self.devices:>8}{self.polls:>8}{round_trips:>11.1f}"
+            f"{latency:>9}{self.sockets:>9}{cpu_per_poll:>13.3f}{self.timeouts:>10}"
+            f"{self.state_writes:>8}"
+        )
+
+
+async def async_create_hass(config_dir: str) -> HomeAssistant:
+    """Start a Home Assistant instance which loads custom components from the repository."""
+    os.symlink(
+        os.path.join(REPOSITORY_PATH, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+
+    hass = HomeAssistant()
+    hass.config.config_dir = config_dir
+    hass.config.skip_pip = True
+
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+
+    # Loaded by bootstrap in a regular Home Assistant start
+    await asyncio.gather(
+        device_registry.async_load(hass),
+        entity_registry.async_load(hass),
+        area_registry.async_load(hass),
+    )
+
+    await async_setup_component(hass, "homeassistant", {})
+    await hass.async_start()
+
+    return hass
+
+
+async def async_run_api_scenario(
+    fleet: FleetProcess, cycles: int, poll_timeout: float
+) -> BenchmarkResult:
+    """Poll every device with SwitcherApi, all devices concurrently per cycle."""
+    result = BenchmarkResult("api", len(fleet.devices))
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        apis = []
+
+        for device in fleet.devices:
+            config_manager = ConfigManager()
+            await config_manager.update(create_entry(device, {}))
+
+            apis.append(SwitcherApi(hass, config_manager))
+
+        async def async_poll(api: SwitcherApi):
+            started = time.perf_counter()
+
+            try:
+                await asyncio.wait_for(api.async_update(), poll_timeout)
+
+                result.latencies.append(time.perf_counter() - started)
+
+            except asyncio.TimeoutError:
+                result.timeouts += 1
+
+        await fleet.async_update_stats()
+
+        round_trips = fleet.round_trips
+        sockets = fleet.connections
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+
+        for _ in range(cycles):
+            await asyncio.gather(*[async_poll(api) for api in apis])
+
+        result.polls = len(apis) * cycles
+        result.cpu_time = time.process_time() - cpu_started
+        result.wall_time = time.perf_counter() - wall_started
+
+        await fleet.async_update_stats()
+
+        result.round_trips = fleet.round_trips - round_trips
+        result.sockets = fleet.connections - sockets
+
+        await asyncio.gather(*[api.async_close() for api in apis])
+        await hass.async_stop(force=True)
+
+    return result
+
+
+async def async_run_manager_scenario(
+    fleet: FleetProcess, duration: float, use_broadcast: bool
+) -> BenchmarkResult:
+    """Run the integration for all devices, polls are driven by the poll scheduler."""
+    result = BenchmarkResult("manager", len(fleet.devices))
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+
+        def state_changed(event):
+            result.state_writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+
+        options = {CONF_USE_BROADCAST: use_broadcast}
+        entries = [create_entry(device, options) for device in fleet.devices]
+
+        await fleet.async_update_stats()
+
+        polls = fleet.get_requests(REQUEST_STATE)
+        round_trips = fleet.round_trips
+        sockets = fleet.connections
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+
+        for entry in entries:
+            await hass.config_entries.async_add(entry)
+
+        await asyncio.sleep(duration)
+
+        cpu_time = time.process_time() - cpu_started
+        wall_time = time.perf_counter() - wall_started
+
+        await fleet.async_update_stats()
+
+        result.polls = fleet.get_requests(REQUEST_STATE) - polls
+        result.cpu_time = cpu_time
+        result.wall_time = wall_time
+        result.round_trips = fleet.round_trips - round_trips
+        result.sockets = fleet.connections - sockets
+
+        for entry in entries:
+            ha = hass.data[DATA].get(entry.entry_id)
+
+            if ha is not None:
+                stats = ha.api.stats
+                latency = stats.get_latency(95, OPERATION_STATE)
+
+                if latency is not None:
+                    result.latencies.append(latency)
+
+                result.timeouts += stats.timeouts
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+        await hass.async_stop(force=True)
+
+    return result
+
+
+async def async_main(args):
+    print(BenchmarkResult.header())
+
+    for devices in args.devices:
+        fleet = FleetProcess(devices, args)
+
+        await fleet.async_start()
+
+        try:
+            if "api" in args.scenario:
+                print(await async_run_api_scenario(fleet, args.cycles, args.timeout))
+
+            if "manager" in args.scenario:
+                print(
+                    await async_run_manager_scenario(
+                        fleet, args.duration, args.broadcast
+                    )
+                )
+
+        finally:
+            await fleet.async_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=DEFAULT_DEVICES)
+    parser.add_argument(
+        "--scenario", nargs="+", choices=["api", "manager"], default=["api", "manager"]
+    )
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_POLL_TIMEOUT)
+    parser.add_argument("--schedules", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="0 to 1")
+    parser.add_argument("--single-connection", action="store_true")
+    parser.add_argument("--broadcast", action="store_true")
+    parser.add_argument("--log-level", default="WARNING")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,22 @@ import sys
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .helpers import async_set_ha, clear_ha, get_ha, handle_log_level
+from .helpers import (
+    async_register_services,
+    async_remove_snapshot,
+    async_set_ha,
+    clear_ha,
+    get_ha,
+    handle_log_level,
+)
 from .helpers.const import *
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass, config):
+    async_register_services(hass)
+
     return True
 
 
@@ -54,6 +63,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored snapshot of a deleted config entry."""
+    await async_remove_snapshot(hass, entry.entry_id)
+
+
 async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
     """Triggered by config entry options updates."""
     await handle_log_level(hass, entry)
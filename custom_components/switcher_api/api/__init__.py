@@ -1,17 +1,58 @@
+from dataclasses import fields
 from enum import Enum
-from typing import Dict, List, Set, Union
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union, get_type_hints
+
+EXCLUDED_FIELDS = ["unparsed_response"]
+
+
+def _serialize_enum(value: Enum) -> str:
+    return value.name
+
+
+def _member_order(member) -> int:
+    return type(member)._member_names_.index(member.name)
+
+
+def _serialize_set(value: Set) -> List[str]:
+    """Enum members keep their declaration order, so equal sets serialize equally."""
+    members = sorted(value, key=_member_order)
+
+    return [member.name for member in members]
+
+
+def _get_serializer(field_type) -> Optional[Callable]:
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return _serialize_enum
+
+    if getattr(field_type, "__origin__", None) is set:
+        (member_type,) = getattr(field_type, "__args__", (None,))
+
+        if isinstance(member_type, type) and issubclass(member_type, Enum):
+            return _serialize_set
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_extractor(obj_type: type) -> Tuple[Tuple[str, Optional[Callable]], ...]:
+    """Fields of a response type with their serializer, computed once per type."""
+    type_hints = get_type_hints(obj_type)
+
+    return tuple(
+        (field.name, _get_serializer(type_hints.get(field.name, field.type)))
+        for field in fields(obj_type)
+        if field.name not in EXCLUDED_FIELDS
+    )
 
 
 def _serialize_object(obj: object) -> Dict[str, Union[List[str], str]]:
     """Use for converting enum to primitives and remove not relevant keys ."""
     serialized_dict = dict()  # type: Dict[str, Union[List[str], str]]
-    for k, v in obj.__dict__.items():
-        if not k == "unparsed_response":
-            if isinstance(v, Enum):
-                serialized_dict[k] = v.name
-            elif isinstance(v, Set):
-                serialized_dict[k] = [m.name if isinstance(m, Enum) else m for m in v]
-            else:
-                serialized_dict[k] = v
+
+    for name, serializer in _get_extractor(type(obj)):
+        value = getattr(obj, name)
+
+        serialized_dict[name] = value if serializer is None else serializer(value)
 
     return serialized_dict
@@ -0,0 +1,177 @@
+"""Listener for the state broadcast sent by Switcher devices over UDP."""
+import asyncio
+from datetime import datetime
+import logging
+from socket import AF_INET
+import time
+from typing import Callable, Dict, Optional
+
+from aioswitcher.bridge import DatagramParser
+from aioswitcher.device import DeviceCategory, DeviceState
+from aioswitcher.device.tools import watts_to_amps
+
+from homeassistant.core import HomeAssistant
+
+from ..helpers.const import *
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BroadcastProtocol(asyncio.DatagramProtocol):
+    def __init__(self, on_datagram: Callable[[bytes], None]):
+        self._on_datagram = on_datagram
+
+    def datagram_received(self, data: bytes, addr):
+        self._on_datagram(data)
+
+    def error_received(self, exc: Optional[Exception]):
+        _LOGGER.debug(f"Broadcast listener received error: {exc}")
+
+
+class BroadcastListener:
+    """Single UDP listener for all config entries, routing by device ID.
+
+    Datagrams of devices which are not registered are dropped before
+    being parsed.
+    """
+
+    started: Optional[datetime]
+    datagrams: int
+    dropped: int
+    invalid: int
+    parsed: int
+    parse_time: float
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._transport = None
+        self._devices: Dict[str, Callable[[dict], None]] = {}
+
+        self.started = None
+        self.datagrams = 0
+        self.dropped = 0
+        self.invalid = 0
+        self.parsed = 0
+        self.parse_time = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    @property
+    def packets_per_second(self) -> float:
+        if self.started is None:
+            return 0
+
+        uptime = (datetime.utcnow() - self.started).total_seconds()
+
+        return self.datagrams / uptime if uptime > 0 else 0
+
+    @property
+    def average_parse_time(self) -> float:
+        if self.parsed == 0:
+            return 0
+
+        return self.parse_time / self.parsed
+
+    @property
+    def stats_summary(self) -> str:
+        summary = (
+            f"Datagrams: {self.datagrams}, "
+            f"Packets per second: {self.packets_per_second:.2f}, "
+            f"Dropped: {self.dropped}, Invalid: {self.invalid}, "
+            f"Average parse time: {self.average_parse_time * 1000:.3f}ms"
+        )
+
+        return summary
+
+    async def async_register(self, device_id: str, on_state: Callable[[dict], None]):
+        self._devices[self._normalize(device_id)] = on_state
+
+        if not self.is_running:
+            await self._async_start()
+
+    async def async_unregister(self, device_id: str):
+        self._devices.pop(self._normalize(device_id), None)
+
+        if len(self._devices) == 0:
+            self._stop()
+
+    @staticmethod
+    def _normalize(device_id: str) -> str:
+        """Lowercase hex as in the datagram, the ID may be entered in uppercase."""
+        return device_id.strip().lower()
+
+    async def _async_start(self):
+        transport, _ = await self._hass.loop.create_datagram_endpoint(
+            lambda: BroadcastProtocol(self._on_datagram),
+            local_addr=("0.0.0.0", BROADCAST_PORT),  # nosec
+            family=AF_INET,
+        )
+
+        self._transport = transport
+        self.started = datetime.utcnow()
+
+        _LOGGER.debug(f"Listening to broadcast on port {BROADCAST_PORT}")
+
+    def _stop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+        _LOGGER.debug(f"Stopped listening to broadcast, {self.stats_summary}")
+
+    def _on_datagram(self, data: bytes):
+        self.datagrams += 1
+
+        if len(data) != BROADCAST_MESSAGE_LENGTH or data[0:2] != BROADCAST_PREFIX:
+            self.invalid += 1
+            return
+
+        device_id = data[18:21].hex()
+        on_state = self._devices.get(device_id)
+
+        if on_state is None:
+            self.dropped += 1
+            return
+
+        started = time.perf_counter()
+
+        try:
+            state = self._parse(data)
+
+        except Exception as ex:
+            self.invalid += 1
+
+            _LOGGER.debug(f"Failed to parse broadcast of {device_id}, Error: {ex}")
+
+            return
+
+        self.parsed += 1
+        self.parse_time += time.perf_counter() - started
+
+        on_state(state)
+
+    @staticmethod
+    def _parse(data: bytes) -> dict:
+        parser = DatagramParser(data)
+
+        device_state = parser.get_device_state()
+        is_on = device_state == DeviceState.ON
+        is_water_heater = (
+            parser.get_device_type().category == DeviceCategory.WATER_HEATER
+        )
+
+        power_consumption = parser.get_power_consumption() if is_on else 0
+
+        state = {
+            KEY_STATE: device_state.name,
+            KEY_POWER_CONSUMPTION: power_consumption,
+            KEY_ELECTRIC_CURRENT: watts_to_amps(power_consumption) if is_on else 0.0,
+        }
+
+        if is_water_heater:
+            state[KEY_TIME_LEFT] = parser.get_remaining() if is_on else "00:00:00"
+            state[KEY_AUTO_SHUTDOWN] = parser.get_auto_shutdown()
+
+        return state
@@ -0,0 +1,75 @@
+"""Circuit breaker for devices which stopped responding."""
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Optional
+
+from ..helpers.const import *
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Backs off exponentially from a failing device, probing it once per period."""
+
+    state: str
+    failures: int
+    waiting_time: float
+    open_until: Optional[datetime]
+
+    def __init__(self):
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.waiting_time = 0
+        self.open_until = None
+
+        self._is_probing = False
+
+    @property
+    def is_available(self) -> bool:
+        return self.state == BREAKER_CLOSED
+
+    def allow_request(self) -> bool:
+        if self.state == BREAKER_CLOSED:
+            return True
+
+        if self.state == BREAKER_OPEN and datetime.utcnow() >= self.open_until:
+            self.state = BREAKER_HALF_OPEN
+
+        if self.state == BREAKER_HALF_OPEN and not self._is_probing:
+            self._is_probing = True
+
+            return True
+
+        return False
+
+    def record_success(self):
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.open_until = None
+
+        self._is_probing = False
+
+    def record_failure(self, elapsed: float):
+        """Register a failed call, returns the back off period once the circuit opens."""
+        self.failures += 1
+        self.waiting_time += elapsed
+
+        self._is_probing = False
+
+        if self.failures < CIRCUIT_BREAKER_THRESHOLD:
+            return None
+
+        attempt = min(self.failures - CIRCUIT_BREAKER_THRESHOLD, 16)
+        base_delay = CIRCUIT_BREAKER_BASE_DELAY.total_seconds()
+        max_delay = CIRCUIT_BREAKER_MAX_DELAY.total_seconds()
+
+        delay = min(base_delay * (2 ** attempt), max_delay)
+        delay = random.uniform(delay / 2, delay)
+
+        backoff = timedelta(seconds=delay)
+
+        self.state = BREAKER_OPEN
+        self.open_until = datetime.utcnow() + backoff
+
+        return backoff
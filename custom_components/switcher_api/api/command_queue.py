@@ -0,0 +1,196 @@
+"""Per device queue, serializing the requests sent to the device."""
+import asyncio
+from datetime import datetime, timedelta
+import heapq
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+
+from ..helpers.const import *
+from ..models import CommandExpiredError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandRequest:
+    priority: int
+    sequence: int
+    action: Callable[[], Awaitable[Any]]
+    coalesce_key: Optional[str]
+    enqueued: datetime
+    deadline: datetime
+    futures: List[asyncio.Future]
+
+    def __init__(
+        self,
+        priority: int,
+        sequence: int,
+        action: Callable[[], Awaitable[Any]],
+        coalesce_key: Optional[str],
+        deadline: timedelta,
+    ):
+        self.priority = priority
+        self.sequence = sequence
+        self.action = action
+        self.coalesce_key = coalesce_key
+        self.enqueued = datetime.utcnow()
+        self.deadline = self.enqueued + deadline
+        self.futures = []
+
+    def __lt__(self, other: "CommandRequest"):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class CommandQueue:
+    """Runs one request at a time, user commands first.
+
+    A request with a coalesce key replaces the action of a pending request
+    with the same key, all callers of the pending request receive the
+    result of the last action, the only one sent to the device.
+    """
+
+    executed: int
+    coalesced: int
+    expired: int
+    abandoned: int
+    max_depth: int
+    total_wait_time: float
+    max_wait_time: float
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+
+        self._pending: List[CommandRequest] = []
+        self._coalesced: Dict[str, CommandRequest] = {}
+        self._sequence = 0
+        self._worker: Optional[asyncio.Task] = None
+
+        self.executed = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.abandoned = 0
+        self.max_depth = 0
+        self.total_wait_time = 0
+        self.max_wait_time = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def average_wait_time(self) -> float:
+        if self.executed == 0:
+            return 0
+
+        return self.total_wait_time / self.executed
+
+    async def async_submit(
+        self,
+        action: Callable[[], Awaitable[Any]],
+        priority: int = QUEUE_PRIORITY_COMMAND,
+        coalesce_key: Optional[str] = None,
+        deadline: timedelta = QUEUE_DEADLINE_COMMAND,
+    ):
+        future = self._hass.loop.create_future()
+
+        request = self._coalesced.get(coalesce_key)
+
+        if request is None:
+            self._sequence += 1
+
+            request = CommandRequest(
+                priority, self._sequence, action, coalesce_key, deadline
+            )
+
+            heapq.heappush(self._pending, request)
+
+            if coalesce_key is not None:
+                self._coalesced[coalesce_key] = request
+
+            self.max_depth = max(self.max_depth, self.depth)
+
+        else:
+            request.action = action
+            request.deadline = datetime.utcnow() + deadline
+
+            self.coalesced += 1
+
+        request.futures.append(future)
+
+        if self._worker is None or self._worker.done():
+            self._worker = self._hass.loop.create_task(self._async_process())
+
+        return await future
+
+    async def async_close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        while self._pending:
+            request = heapq.heappop(self._pending)
+
+            for future in request.futures:
+                if not future.done():
+                    future.cancel()
+
+        self._coalesced.clear()
+
+    async def _async_process(self):
+        while self._pending:
+            request = heapq.heappop(self._pending)
+
+            if request.coalesce_key is not None:
+                self._coalesced.pop(request.coalesce_key, None)
+
+            now = datetime.utcnow()
+
+            if now > request.deadline:
+                self.expired += 1
+
+                for future in request.futures:
+                    if not future.done():
+                        future.set_exception(CommandExpiredError(request.deadline))
+
+                continue
+
+            # Every caller timed out or was cancelled, do not hold the queue
+            # for a request nobody waits for
+            if all(future.done() for future in request.futures):
+                self.abandoned += 1
+
+                continue
+
+            wait_time = (now - request.enqueued).total_seconds()
+
+            self.executed += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+            try:
+                result = await request.action()
+
+            except asyncio.CancelledError:
+                for future in request.futures:
+                    future.cancel()
+
+                raise
+
+            except Exception as ex:
+                for future in request.futures:
+                    if not future.done():
+                        future.set_exception(ex)
+
+            else:
+                # Coalesced callers get the result of the action which ran,
+                # not of their own
+                for future in request.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+        _LOGGER.debug(
+            f"Queue drained, executed: {self.executed}, coalesced: {self.coalesced}, "
+            f"expired: {self.expired}, abandoned: {self.abandoned}, "
+            f"max depth: {self.max_depth}, average wait: {self.average_wait_time:.3f}s"
+        )
@@ -0,0 +1,97 @@
+"""Rolling statistics of the requests sent to a Switcher device."""
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from ..helpers.const import *
+
+
+class RequestSample(NamedTuple):
+    operation: str
+    latency: float
+    is_success: bool
+    is_timeout: bool
+
+
+class RequestStats:
+    """Latency and outcome of the last requests, shared by all operations."""
+
+    timeouts: int
+    operation_timeouts: Dict[str, int]
+    last_successful_poll: Optional[datetime]
+
+    def __init__(self, window: int = REQUEST_STATS_WINDOW):
+        self._samples: Deque[RequestSample] = deque(maxlen=window)
+
+        self.timeouts = 0
+        self.operation_timeouts = {}
+        self.last_successful_poll = None
+
+    @property
+    def requests(self) -> int:
+        return len(self._samples)
+
+    @property
+    def failures(self) -> int:
+        return len([sample for sample in self._samples if not sample.is_success])
+
+    @property
+    def success_ratio(self) -> Optional[float]:
+        if self.requests == 0:
+            return None
+
+        return (self.requests - self.failures) / self.requests
+
+    def record(self, operation: str, latency: float, is_success: bool):
+        self._samples.append(RequestSample(operation, latency, is_success, False))
+
+        if is_success and operation in [OPERATION_STATE, OPERATION_SCHEDULES]:
+            self.last_successful_poll = datetime.utcnow()
+
+    def record_timeout(self, operation: str, latency: float):
+        self._samples.append(RequestSample(operation, latency, False, True))
+
+        self.timeouts += 1
+        self.operation_timeouts[operation] = self.operation_timeouts.get(operation, 0) + 1
+
+    def get_latency(self, percentile: int, operation: Optional[str] = None) -> Optional[float]:
+        """Latency in seconds of the requests completed within the window."""
+        latencies = self._get_latencies(operation)
+
+        if len(latencies) == 0:
+            return None
+
+        index = round((percentile / 100) * (len(latencies) - 1))
+
+        return latencies[index]
+
+    def get_operations(self) -> List[str]:
+        operations = []
+
+        for sample in self._samples:
+            if sample.operation not in operations:
+                operations.append(sample.operation)
+
+        return operations
+
+    def get_latency_summary(self) -> Dict[str, Optional[float]]:
+        """Latency percentiles per operation, in seconds."""
+        summary = {}
+
+        for operation in self.get_operations():
+            for percentile in REQUEST_STATS_PERCENTILES:
+                latency = self.get_latency(percentile, operation)
+
+                summary[f"{operation}_p{percentile}"] = latency
+
+        return summary
+
+    def _get_latencies(self, operation: Optional[str]) -> List[float]:
+        latencies = [
+            sample.latency
+            for sample in self._samples
+            if not sample.is_timeout
+            and (operation is None or sample.operation == operation)
+        ]
+
+        return sorted(latencies)
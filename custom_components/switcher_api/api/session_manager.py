@@ -0,0 +1,201 @@
+"""Persistent session handling for the Switcher TCP API."""
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from aioswitcher.api import SwitcherApi as SwitcherClient
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from ..helpers.const import *
+from ..managers.configuration_manager import ConfigManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """Keeps a single connection per device alive and reuses it across calls."""
+
+    connections: int
+    reuses: int
+    reconnects: int
+    expirations: int
+    timeouts: int
+
+    def __init__(self, hass: HomeAssistant, config_manager: ConfigManager):
+        self._hass = hass
+        self._config_manager = config_manager
+
+        self._client: Optional[SwitcherClient] = None
+        self._endpoint = None
+        self._last_activity: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._remove_idle_timer = None
+
+        self.connections = 0
+        self.reuses = 0
+        self.reconnects = 0
+        self.expirations = 0
+        self.timeouts = 0
+
+    @property
+    def endpoint(self):
+        config_data = self._config_manager.data
+
+        return config_data.ip_address, config_data.device_id
+
+    @property
+    def idle_timeout(self) -> timedelta:
+        config_data = self._config_manager.data
+        max_poll_interval = timedelta(seconds=config_data.max_poll_interval)
+
+        return max(SESSION_IDLE_TIMEOUT, max_poll_interval + SESSION_IDLE_MARGIN)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.connected
+
+    async def async_execute(
+        self, action: Callable[[SwitcherClient], Awaitable[Any]], timeout: float
+    ):
+        """Run an action against the device using the pooled connection.
+
+        A failure on a reused connection is treated as a stale session,
+        the action is retried once over a new connection. Connecting and
+        retrying are bounded by the timeout, once it passes the connection
+        is closed (a late response would be read by the next request) and
+        asyncio.TimeoutError is raised.
+        """
+        async with self._lock:
+            try:
+                result = await asyncio.wait_for(self._async_execute(action), timeout)
+
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+
+                _LOGGER.debug(f"Session to {self.endpoint} timed out after {timeout}s")
+
+                await self._async_disconnect()
+
+                raise
+
+            return result
+
+    async def _async_execute(self, action: Callable[[SwitcherClient], Awaitable[Any]]):
+        is_reused = await self._async_connect()
+
+        try:
+            result = await action(self._client)
+
+        except Exception as ex:
+            await self._async_disconnect()
+
+            if not is_reused:
+                raise
+
+            _LOGGER.debug(
+                f"Session to {self._endpoint} failed, reconnecting, Error: {ex}"
+            )
+
+            self.reconnects += 1
+
+            await self._async_connect()
+
+            try:
+                result = await action(self._client)
+
+            except Exception:
+                await self._async_disconnect()
+
+                raise
+
+        self._last_activity = datetime.utcnow()
+        self._schedule_idle_disconnect()
+
+        return result
+
+    async def async_close(self):
+        async with self._lock:
+            self._cancel_idle_timer()
+
+            await self._async_disconnect()
+
+    async def _async_connect(self) -> bool:
+        endpoint = self.endpoint
+
+        if self.is_connected:
+            idle_time = datetime.utcnow() - self._last_activity
+
+            if endpoint != self._endpoint:
+                _LOGGER.debug(f"Device endpoint changed to {endpoint}, reconnecting")
+
+                await self._async_disconnect()
+
+            elif idle_time >= self.idle_timeout:
+                self.expirations += 1
+
+                await self._async_disconnect()
+
+            else:
+                self.reuses += 1
+
+                return True
+
+        ip_address, device_id = endpoint
+
+        client = SwitcherClient(ip_address, device_id)
+        await client.connect()
+
+        self._client = client
+        self._endpoint = endpoint
+        self._last_activity = datetime.utcnow()
+
+        self.connections += 1
+
+        return False
+
+    async def _async_disconnect(self):
+        client = self._client
+
+        self._client = None
+
+        if client is not None:
+            try:
+                await client.disconnect()
+
+            except Exception as ex:
+                _LOGGER.debug(f"Failed to disconnect from {self._endpoint}, Error: {ex}")
+
+    def _schedule_idle_disconnect(self):
+        self._cancel_idle_timer()
+
+        self._remove_idle_timer = async_call_later(
+            self._hass, self.idle_timeout.total_seconds(), self._idle_disconnect
+        )
+
+    def _cancel_idle_timer(self):
+        if self._remove_idle_timer is not None:
+            self._remove_idle_timer()
+            self._remove_idle_timer = None
+
+    @callback
+    def _idle_disconnect(self, now):
+        self._remove_idle_timer = None
+
+        self._hass.async_create_task(self._async_idle_disconnect())
+
+    async def _async_idle_disconnect(self):
+        async with self._lock:
+            if not self.is_connected:
+                return
+
+            idle_time = datetime.utcnow() - self._last_activity
+
+            if idle_time >= self.idle_timeout:
+                _LOGGER.debug(f"Closing idle session to {self._endpoint}")
+
+                self.expirations += 1
+
+                await self._async_disconnect()
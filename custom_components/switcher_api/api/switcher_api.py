@@ -1,34 +1,86 @@
 """Request handlers for the Switcher WebAPI."""
+import asyncio
 from datetime import datetime, time
 import logging
 import sys
-from typing import List, Optional
+import time as timer
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from aioswitcher.api import Command, SwitcherApi as SwitcherClient
+from aioswitcher.api import Command
+from aioswitcher.device import DeviceState
 from aioswitcher.schedule import Days
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, callback
 
 from . import _serialize_object
 from ..helpers.const import *
 from ..managers.configuration_manager import ConfigManager
+from ..models import CommandExpiredError, DeviceUnavailableError
+from ..models.control_result import ControlResult
+from ..models.state_data import StateData
+from .circuit_breaker import CircuitBreaker
+from .command_queue import CommandQueue
+from .request_stats import RequestStats
+from .session_manager import SessionManager
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class SwitcherApi:
-    state: dict
+    state: StateData
     schedules: dict
     last_update: datetime
-    is_updating: bool
+    state_updated: Optional[datetime]
+    schedules_updated: Optional[datetime]
+    deduplicated_requests: int
+    data_version: int
+    last_command: Optional[datetime]
+    last_broadcast: Optional[datetime]
+    on_state_changed: Optional[Callable[[], None]]
 
     def __init__(self, hass: HomeAssistant, config_manager: ConfigManager):
         self._hass = hass
         self._config_manager = config_manager
         self.schedules = {}
-        self.state = {}
+        self.state = StateData()
         self.last_update = datetime.utcnow()
-        self.is_updating = False
+        self.state_updated = None
+        self.schedules_updated = None
+        self.deduplicated_requests = 0
+        self.data_version = 0
+        self.last_command = None
+        self.last_broadcast = None
+
+        self.on_state_changed = None
+
+        self._session = SessionManager(hass, config_manager)
+        self._breaker = CircuitBreaker()
+        self._queue = CommandQueue(hass)
+        self._stats = RequestStats()
+        self._listening_device_id: Optional[str] = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._control_sequence = 0
+
+    @property
+    def session(self) -> SessionManager:
+        return self._session
+
+    @property
+    def queue(self) -> CommandQueue:
+        return self._queue
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    @property
+    def stats(self) -> RequestStats:
+        return self._stats
+
+    @property
+    def is_available(self) -> bool:
+        return self._breaker.is_available
 
     @property
     def config_data(self):
@@ -46,30 +98,394 @@ class SwitcherApi:
     def device_details(self):
         return f"IP: {self.ip_address}, Device: {self.device_id}"
 
-    async def async_update(self):
-        if not self.is_updating:
-            self.is_updating = True
+    @property
+    def is_on(self) -> bool:
+        state = self.state.state or STATE_OFF
+
+        return state.lower() == STATE_ON
+
+    @property
+    def remaining_seconds(self) -> int:
+        time_left = self.state.time_left
+        seconds = 0
+
+        if time_left:
+            hours, minutes, secs = [int(part) for part in time_left.split(":")]
+            seconds = (hours * 3600) + (minutes * 60) + secs
+
+        return seconds
+
+    def get_poll_interval(self) -> timedelta:
+        """Poll fast while the device is running or was just controlled, slow otherwise."""
+        min_interval = self.config_data.min_poll_interval
+        max_interval = self.config_data.max_poll_interval
+
+        is_recent_command = (
+            self.last_command is not None
+            and datetime.utcnow() - self.last_command < COMMAND_ACTIVITY_PERIOD
+        )
+
+        is_running = self.is_on or self.remaining_seconds > 0
+
+        interval = min_interval if is_running or is_recent_command else max_interval
+
+        return timedelta(seconds=interval)
+
+    @property
+    def is_broadcast_active(self) -> bool:
+        if self.last_broadcast is None:
+            return False
+
+        time_since_broadcast = datetime.utcnow() - self.last_broadcast
+        seconds_since_broadcast = time_since_broadcast.total_seconds()
+
+        return seconds_since_broadcast < self.config_data.fallback_interval
+
+    async def async_update_listener(self):
+        use_broadcast = self.config_data.use_broadcast
+        listening_device_id = self._listening_device_id
+
+        if listening_device_id is not None and (
+            not use_broadcast or listening_device_id != self.device_id
+        ):
+            await self._get_broadcast_listener().async_unregister(listening_device_id)
+
+            self._listening_device_id = None
+            self.last_broadcast = None
+
+        if use_broadcast and self._listening_device_id is None:
+            try:
+                listener = self._get_broadcast_listener()
+
+                await listener.async_register(self.device_id, self._on_broadcast_state)
+
+                self._listening_device_id = self.device_id
+
+            except Exception as ex:
+                exc_type, exc_obj, tb = sys.exc_info()
+                line = tb.tb_lineno
+
+                _LOGGER.error(
+                    f"Failed to listen to broadcast, {self.device_details}, Error: {ex}, Line: {line}"
+                )
+
+    def _get_broadcast_listener(self):
+        """Shared listener, imported and created once the first entry uses broadcast."""
+        ha_data = self._hass.data[DATA]
+
+        if DATA_BROADCAST_LISTENER not in ha_data:
+            from .broadcast_listener import BroadcastListener
+
+            ha_data[DATA_BROADCAST_LISTENER] = BroadcastListener(self._hass)
+
+        return ha_data[DATA_BROADCAST_LISTENER]
+
+    @callback
+    def _on_broadcast_state(self, broadcast_state: dict):
+        self.last_broadcast = datetime.utcnow()
+
+        state = self.state._replace(**broadcast_state)
+
+        if self._update_state(state):
+            _LOGGER.debug(f"Broadcast state: {broadcast_state}")
 
-            now = datetime.utcnow()
-            time_since_last_updated = now - self.last_update
-            seconds_since_last_updated = time_since_last_updated.total_seconds()
-            should_update_schedules = seconds_since_last_updated >= 60
+            self._notify_state_changed()
 
+    def _update_state(self, state: StateData) -> bool:
+        is_changed = state != self.state
+
+        if is_changed:
+            self.state = state
+            self.data_version += 1
+
+        return is_changed
+
+    def _notify_state_changed(self):
+        if self.on_state_changed is not None:
+            self.on_state_changed()
+
+    async def async_update_state(self):
+        """Refresh only the device state, used to reconcile after a command."""
+        state = await self._get_state()
+
+        if state and self._update_state(state):
+            _LOGGER.debug(f"State: {state}")
+
+            self._notify_state_changed()
+
+    @property
+    def should_poll_state(self) -> bool:
+        """Broadcast carries no time on, it is polled at the slow interval meanwhile."""
+        if not self.is_broadcast_active or self.state_updated is None:
+            return True
+
+        time_since_updated = datetime.utcnow() - self.state_updated
+        seconds_since_updated = time_since_updated.total_seconds()
+
+        return seconds_since_updated >= self.config_data.max_poll_interval
+
+    @property
+    def should_update_schedules(self) -> bool:
+        if self.schedules_updated is None:
+            return True
+
+        time_since_updated = datetime.utcnow() - self.schedules_updated
+        seconds_since_updated = time_since_updated.total_seconds()
+
+        return seconds_since_updated >= self.config_data.schedules_interval
+
+    def invalidate_schedules(self):
+        """Fetch the schedules from the device on the next update."""
+        self.schedules_updated = None
+
+        self._detach_in_flight(OPERATION_SCHEDULES)
+
+    def restore(self, state: dict, schedules: dict):
+        """Start from a stored snapshot, the first update still fetches everything."""
+        self.state = StateData.from_dict(state)
+        self.schedules = schedules
+        self.schedules_updated = None
+        self.data_version += 1
+
+    def _update_schedules(self, schedules: dict) -> bool:
+        self.schedules_updated = datetime.utcnow()
+
+        is_changed = schedules != self.schedules
+
+        if is_changed:
+            _LOGGER.debug(f"Schedules: {schedules}")
+
+            self.schedules = schedules
+            self.data_version += 1
+
+        return is_changed
+
+    async def async_update_schedules(self):
+        """Refresh only the schedules, used after creating or deleting a schedule."""
+        self.invalidate_schedules()
+
+        schedules = await self._get_schedules()
+
+        if schedules and self._update_schedules(schedules):
+            self._notify_state_changed()
+
+    async def async_update(self):
+        if not self.should_poll_state:
+            _LOGGER.debug(f"Skip polling state, broadcast is active, {self.device_details}")
+
+        else:
             state = await self._get_state()
 
-            if state:
+            if state and self._update_state(state):
                 _LOGGER.debug(f"State: {state}")
-                self.state = state
 
-            if should_update_schedules:
-                schedules = await self._get_schedules()
+        if self.should_update_schedules:
+            schedules = await self._get_schedules()
+
+            if schedules:
+                self._update_schedules(schedules)
+
+        self.last_update = datetime.utcnow()
+
+        session = self._session
+        _LOGGER.debug(
+            f"Session stats, {self.device_details}, "
+            f"Connections: {session.connections}, Reuses: {session.reuses}, "
+            f"Reconnects: {session.reconnects}, Expirations: {session.expirations}, "
+            f"Timeouts: {session.timeouts}"
+        )
+
+        queue = self._queue
+        _LOGGER.debug(
+            f"Queue stats, {self.device_details}, "
+            f"Depth: {queue.depth}, Max depth: {queue.max_depth}, "
+            f"Average wait: {queue.average_wait_time:.3f}s, Max wait: {queue.max_wait_time:.3f}s, "
+            f"Coalesced: {queue.coalesced}, Expired: {queue.expired}, "
+            f"Abandoned: {queue.abandoned}"
+        )
+
+        if self._listening_device_id is not None:
+            listener = self._get_broadcast_listener()
+            _LOGGER.debug(f"Broadcast stats, {listener.stats_summary}")
+
+        stats = self._stats
+        _LOGGER.debug(
+            f"Request stats, {self.device_details}, "
+            f"Requests: {stats.requests}, Failures: {stats.failures}, "
+            f"Timeouts: {stats.timeouts} {stats.operation_timeouts}, "
+            f"Deduplicated: {self.deduplicated_requests}, "
+            f"Latency: {stats.get_latency_summary()}"
+        )
+
+    async def _async_single_flight(
+        self, operation: str, fetch: Callable[[], Awaitable[Any]]
+    ):
+        """Concurrent callers of an operation share the request in flight.
+
+        The request runs in its own task under a hard timeout (time allowed in
+        the queue and for the request itself), a cancelled caller does not
+        cancel it for the other callers.
+        """
+        request = self._in_flight.get(operation)
+
+        if request is None:
+            request = self._hass.async_create_task(
+                self._async_fetch_with_timeout(operation, fetch)
+            )
+
+            self._in_flight[operation] = request
+
+            def clear(task: asyncio.Task):
+                if self._in_flight.get(operation) is task:
+                    self._in_flight.pop(operation)
+
+            request.add_done_callback(clear)
+
+        else:
+            self.deduplicated_requests += 1
+
+        return await asyncio.shield(request)
+
+    def _detach_in_flight(self, operation: str):
+        """Next callers start a new request, the one in flight may be outdated."""
+        self._in_flight.pop(operation, None)
+
+    async def _async_fetch_with_timeout(
+        self, operation: str, fetch: Callable[[], Awaitable[Any]]
+    ):
+        started = timer.perf_counter()
+        timeout = QUEUE_DEADLINE_POLL.total_seconds() + self._get_timeout(operation)
+
+        try:
+            result = await asyncio.wait_for(fetch(), timeout)
+
+        except asyncio.TimeoutError:
+            self._stats.record_timeout(operation, timer.perf_counter() - started)
+
+            _LOGGER.warning(
+                f"Request timed out, {self.device_details}, Operation: {operation}"
+            )
+
+            result = None
+
+        return result
+
+    async def _async_execute(
+        self,
+        action,
+        operation: str,
+        priority: int = QUEUE_PRIORITY_COMMAND,
+        coalesce_key: Optional[str] = None,
+    ):
+        is_poll = priority == QUEUE_PRIORITY_POLL
+        deadline = QUEUE_DEADLINE_POLL if is_poll else QUEUE_DEADLINE_COMMAND
+
+        started = timer.perf_counter()
+
+        try:
+            result = await self._queue.async_submit(
+                lambda: self._async_send(action, operation),
+                priority,
+                coalesce_key,
+                deadline,
+            )
+
+        except CommandExpiredError:
+            self._stats.record_timeout(operation, timer.perf_counter() - started)
+
+            raise
+
+        return result
+
+    def _get_timeout(self, operation: str) -> int:
+        """Seconds a request of the operation may take before it is cancelled."""
+        config_data = self.config_data
+
+        timeouts = {
+            OPERATION_STATE: config_data.state_timeout,
+            OPERATION_SCHEDULES: config_data.schedules_timeout,
+            OPERATION_CONTROL: config_data.control_timeout,
+            OPERATION_CONFIGURATION: config_data.configuration_timeout,
+        }
+
+        return timeouts.get(operation, DEFAULT_CONFIGURATION_TIMEOUT)
+
+    def _log_timeout(self, operation: str):
+        timeout = self._get_timeout(operation)
+
+        _LOGGER.warning(
+            f"Request timed out after {timeout} seconds, {self.device_details}, Operation: {operation}"
+        )
+
+    async def _async_send(self, action, operation: str):
+        breaker = self._breaker
+        was_available = breaker.is_available
+
+        if not breaker.allow_request():
+            raise DeviceUnavailableError(self.device_details)
+
+        started = timer.perf_counter()
+
+        try:
+            timeout = self._get_timeout(operation)
+
+            result = await self._session.async_execute(action, timeout)
+
+        except Exception as ex:
+            elapsed = timer.perf_counter() - started
+
+            if isinstance(ex, asyncio.TimeoutError):
+                self._stats.record_timeout(operation, elapsed)
+            else:
+                self._stats.record(operation, elapsed, False)
+
+            backoff = breaker.record_failure(elapsed)
+
+            if backoff is None:
+                raise
+
+            if was_available:
+                _LOGGER.warning(
+                    f"Device is unreachable, {self.device_details}, Error: {ex}, "
+                    f"retrying in {backoff.total_seconds():.0f} seconds"
+                )
+
+                self.data_version += 1
+
+            raise DeviceUnavailableError(self.device_details) from ex
+
+        is_success = getattr(result, "successful", True)
+        self._stats.record(operation, timer.perf_counter() - started, is_success)
+
+        breaker.record_success()
+
+        if not was_available:
+            _LOGGER.info(
+                f"Device is reachable again, {self.device_details}, "
+                f"time spent on failed requests: {breaker.waiting_time:.1f} seconds"
+            )
+
+            self.data_version += 1
+
+        return result
+
+    async def async_close(self):
+        for request in list(self._in_flight.values()):
+            request.cancel()
+
+        if self._listening_device_id is not None:
+            listener = self._get_broadcast_listener()
+            await listener.async_unregister(self._listening_device_id)
 
-                if schedules:
-                    _LOGGER.debug(f"Schedules: {schedules}")
-                    self.schedules = schedules
+            self._listening_device_id = None
 
-            self.last_update = datetime.utcnow()
-            self.is_updating = False
+        await self._queue.async_close()
+        await self._session.async_close()
+
+    async def get_state(self) -> Optional[StateData]:
+        state = await self._get_state()
+
+        return state
 
     async def create_schedule(self, days: List[str], start_time: str, stop_time: str):
         is_success = False
@@ -80,15 +496,25 @@ class SwitcherApi:
                 {weekdays[d] for d in days[KEY_DAYS]} if days else set()
             )
 
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.create_schedule(start_time, stop_time, selected_days)
+            state = await self._async_execute(
+                lambda api: api.create_schedule(start_time, stop_time, selected_days),
+                OPERATION_CONFIGURATION,
+            )
+
+            if state.successful:
+                _LOGGER.debug(f"Create Schedule successfully completed, Response: {state}")
+
+                self._hass.async_create_task(self.async_update_schedules())
+            else:
+                _LOGGER.error(f"Failed to Create Schedule")
+
+            is_success = state.successful
 
-                if state.successful:
-                    _LOGGER.debug(f"Create Schedule successfully completed, Response: {state}")
-                else:
-                    _LOGGER.error(f"Failed to Create Schedule")
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip create schedule, device is unavailable, {self.device_details}")
 
-                is_success = state.successful
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_CONFIGURATION)
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -102,15 +528,24 @@ class SwitcherApi:
         is_success = False
 
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.delete_schedule(schedule_id)
+            state = await self._async_execute(
+                lambda api: api.delete_schedule(schedule_id), OPERATION_CONFIGURATION
+            )
+
+            if state.successful:
+                _LOGGER.debug(f"Delete Schedule successfully completed, Response: {state}")
+
+                self._hass.async_create_task(self.async_update_schedules())
+            else:
+                _LOGGER.error(f"Failed to Delete Schedule")
 
-                if state.successful:
-                    _LOGGER.debug(f"Delete Schedule successfully completed, Response: {state}")
-                else:
-                    _LOGGER.error(f"Failed to Delete Schedule")
+            is_success = state.successful
 
-                is_success = state.successful
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip delete schedule, device is unavailable, {self.device_details}")
+
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_CONFIGURATION)
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -121,18 +556,38 @@ class SwitcherApi:
         return is_success
 
     async def _get_schedules(self):
+        schedules = await self._async_single_flight(
+            OPERATION_SCHEDULES, self._async_fetch_schedules
+        )
+
+        return schedules
+
+    async def _async_fetch_schedules(self):
         response = None
 
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.get_schedules()
+            state = await self._async_execute(
+                lambda api: api.get_schedules(), OPERATION_SCHEDULES, QUEUE_PRIORITY_POLL
+            )
+
+            if state.successful:
+                schedules = sorted(state.schedules, key=lambda s: int(s.schedule_id))
+
+                response = {
+                    KEY_FOUND_SCHEDULES: state.found_schedules,
+                    KEY_SCHEDULES: [_serialize_object(schedule) for schedule in schedules],
+                }
+
+                _LOGGER.debug(f"Retrieve schedules successfully completed, Response: {state}")
 
-                if state.successful:
-                    response = _serialize_object(state)
-                    _LOGGER.debug(f"Retrieve schedules successfully completed, Response: {state}")
+            else:
+                _LOGGER.error(f"Failed to retrieve schedules")
 
-                else:
-                    _LOGGER.error(f"Failed to retrieve schedules")
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip get schedules, device is unavailable, {self.device_details}")
+
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_SCHEDULES)
 
         except GeneratorExit as gex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -151,19 +606,32 @@ class SwitcherApi:
 
         return response
 
-    async def _get_state(self) -> dict:
+    async def _get_state(self) -> Optional[StateData]:
+        state = await self._async_single_flight(OPERATION_STATE, self._async_fetch_state)
+
+        return state
+
+    async def _async_fetch_state(self) -> Optional[StateData]:
         response = None
 
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.get_state()
+            state = await self._async_execute(
+                lambda api: api.get_state(), OPERATION_STATE, QUEUE_PRIORITY_POLL
+            )
+
+            if state.successful:
+                response = StateData.from_dict(_serialize_object(state))
+                self.state_updated = datetime.utcnow()
+                _LOGGER.debug(f"Retrieved state successfully completed, Response: {state}")
 
-                if state.successful:
-                    response = _serialize_object(state)
-                    _LOGGER.debug(f"Retrieved state successfully completed, Response: {state}")
+            else:
+                _LOGGER.error(f"Failed to retrieve state")
 
-                else:
-                    _LOGGER.error(f"Failed to retrieve state")
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip get state, device is unavailable, {self.device_details}")
+
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_STATE)
 
         except GeneratorExit as gex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -185,16 +653,24 @@ class SwitcherApi:
         is_success = False
 
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                auto_shutdown = timedelta(hours=time_span.hour, minutes=time_span.minute)
-                state = await api.set_auto_shutdown(auto_shutdown)
+            auto_shutdown = timedelta(hours=time_span.hour, minutes=time_span.minute)
+            state = await self._async_execute(
+                lambda api: api.set_auto_shutdown(auto_shutdown),
+                OPERATION_CONFIGURATION,
+            )
+
+            if state.successful:
+                _LOGGER.debug(f"Auto Shutdown Set successfully completed, Response: {state}")
+            else:
+                _LOGGER.error(f"Failed to Set Auto Shutdown")
 
-                if state.successful:
-                    _LOGGER.debug(f"Auto Shutdown Set successfully completed, Response: {state}")
-                else:
-                    _LOGGER.error(f"Failed to Set Auto Shutdown")
+            is_success = state.successful
 
-                is_success = state.successful
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip set auto shutdown, device is unavailable, {self.device_details}")
+
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_CONFIGURATION)
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -210,15 +686,22 @@ class SwitcherApi:
         is_success = False
 
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.set_device_name(new_name)
+            state = await self._async_execute(
+                lambda api: api.set_device_name(new_name), OPERATION_CONFIGURATION
+            )
 
-                if state.successful:
-                    _LOGGER.debug(f"Device Name Set successfully completed, Response: {state}")
-                else:
-                    _LOGGER.error(f"Failed to Set Device Name")
+            if state.successful:
+                _LOGGER.debug(f"Device Name Set successfully completed, Response: {state}")
+            else:
+                _LOGGER.error(f"Failed to Set Device Name")
 
-                is_success = state.successful
+            is_success = state.successful
+
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip set device name, device is unavailable, {self.device_details}")
+
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_CONFIGURATION)
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -243,19 +726,55 @@ class SwitcherApi:
         command = Command.ON if action else Command.OFF
         command_name = "On" if action else "Off"
 
+        self.last_command = datetime.utcnow()
+
+        self._control_sequence += 1
+        sequence = self._control_sequence
+
+        async def control(api):
+            response = await api.control_device(command, minutes)
+
+            return ControlResult(sequence, action, response)
+
         try:
-            async with SwitcherClient(self.ip_address, self.device_id) as api:
-                state = await api.control_device(command, minutes)
+            result = await self._async_execute(
+                control, OPERATION_CONTROL, coalesce_key=QUEUE_KEY_CONTROL
+            )
+
+            state = result.response
+
+            # Coalesced by a later command, which applies its own outcome
+            if result.sequence != sequence:
+                executed_name = "On" if result.action else "Off"
+
+                _LOGGER.debug(
+                    f"Turn {command_name} replaced by Turn {executed_name}, {self.device_details}"
+                )
+
+                return state.successful and result.action == action
+
+            if state.successful:
+                _LOGGER.debug(f"Turn {command_name} successfully completed, Response: {state}")
+
+                device_state = DeviceState.ON if result.action else DeviceState.OFF
+                optimistic_state = self.state._replace(state=device_state.name)
+
+                if self._update_state(optimistic_state):
+                    self._notify_state_changed()
+
+                self._detach_in_flight(OPERATION_STATE)
+                self._hass.async_create_task(self.async_update_state())
 
-                if state.successful:
-                    _LOGGER.debug(f"Turn {command_name} successfully completed, Response: {state}")
+            else:
+                _LOGGER.error(f"Failed to Turn {command_name}, {self.device_details}")
 
-                    await self.async_update()
+            is_success = state.successful
 
-                else:
-                    _LOGGER.error(f"Failed to Turn {command_name}, {self.device_details}")
+        except DeviceUnavailableError:
+            _LOGGER.debug(f"Skip toggle state, device is unavailable, {self.device_details}")
 
-                is_success = state.successful
+        except asyncio.TimeoutError:
+            self._log_timeout(OPERATION_CONTROL)
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -7,7 +7,12 @@ from homeassistant.core import callback
 
 from .helpers.const import *
 from .managers.config_flow_manager import ConfigFlowManager
-from .models import AlreadyExistsError, AutoOffError
+from .models import (
+    AlreadyExistsError,
+    AutoOffError,
+    DeadbandError,
+    PollIntervalError,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -114,6 +119,18 @@ class DomainOptionsFlowHandler(config_entries.OptionsFlow):
 
                 errors = {"base": aoe.error_code}
 
+            except PollIntervalError as pie:
+                _LOGGER.warning(
+                    f"Invalid polling intervals {pie.min_interval}-{pie.max_interval}, Error: {pie.error_code}"
+                )
+
+                errors = {"base": pie.error_code}
+
+            except DeadbandError as dbe:
+                _LOGGER.warning(f"Invalid deadband {dbe.deadband}, Error: {dbe.error_code}")
+
+                errors = {"base": dbe.error_code}
+
             except AlreadyExistsError as aeex:
                 _LOGGER.warning(
                     f"{DEFAULT_NAME} with {ENTRY_PRIMARY_KEY}: {aeex.title} already exists"
@@ -1,10 +1,16 @@
 import logging
 import sys
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+import homeassistant.helpers.config_validation as cv
 
 from ..managers.home_assistant import HomeAssistantManager
+from ..managers.poll_scheduler import PollScheduler
+from ..managers.storage_manager import StorageManager
 from .const import *
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +35,12 @@ async def async_set_ha(hass: HomeAssistant, entry: ConfigEntry):
         if DATA not in hass.data:
             hass.data[DATA] = dict()
 
+        if DATA_POLL_SCHEDULER not in hass.data[DATA]:
+            hass.data[DATA][DATA_POLL_SCHEDULER] = PollScheduler(hass)
+
+        if DATA_STORAGE not in hass.data[DATA]:
+            hass.data[DATA][DATA_STORAGE] = StorageManager(hass)
+
         instance = HomeAssistantManager(hass)
 
         await instance.async_init(entry)
@@ -41,6 +53,44 @@ async def async_set_ha(hass: HomeAssistant, entry: ConfigEntry):
         _LOGGER.error(f"Failed to async_set_ha, error: {ex}, line: {line_number}")
 
 
+async def async_remove_snapshot(hass: HomeAssistant, entry_id):
+    ha_data = hass.data.setdefault(DATA, dict())
+
+    if DATA_STORAGE not in ha_data:
+        ha_data[DATA_STORAGE] = StorageManager(hass)
+
+    storage_manager = ha_data[DATA_STORAGE]
+
+    await storage_manager.async_load()
+
+    storage_manager.remove(entry_id)
+
+
+def get_all_ha(hass: HomeAssistant):
+    ha_data = hass.data.get(DATA, dict())
+
+    managers = [
+        ha_data[key] for key in ha_data if isinstance(ha_data[key], HomeAssistantManager)
+    ]
+
+    return managers
+
+
+def async_register_services(hass: HomeAssistant):
+    async def async_refresh_schedules(service_call: ServiceCall):
+        entity_ids = service_call.data.get(ATTR_ENTITY_ID)
+
+        for ha in get_all_ha(hass):
+            if entity_ids is None or ha.has_entity(entity_ids):
+                await ha.async_refresh_schedules()
+
+    schema = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.entity_ids})
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_SCHEDULES, async_refresh_schedules, schema
+    )
+
+
 async def handle_log_level(hass: HomeAssistant, entry: ConfigEntry):
     log_level = entry.options.get(CONF_LOG_LEVEL, LOG_LEVEL_DEFAULT)
 
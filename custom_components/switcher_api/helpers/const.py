@@ -10,6 +10,21 @@ from homeassistant.components.switch import DOMAIN as DOMAIN_SWITCH
 from homeassistant.const import CONF_NAME
 
 CONF_LOG_LEVEL = "log_level"
+CONF_USE_BROADCAST = "use_broadcast"
+CONF_FALLBACK_INTERVAL = "fallback_interval"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_STATE_SENSORS = "state_sensors"
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_CURRENT_DEADBAND = "current_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_MAX_WRITE_INTERVAL = "max_write_interval"
+CONF_SCHEDULES_INTERVAL = "schedules_interval"
+CONF_STATE_TIMEOUT = "state_timeout"
+CONF_SCHEDULES_TIMEOUT = "schedules_timeout"
+CONF_CONTROL_TIMEOUT = "control_timeout"
+CONF_CONFIGURATION_TIMEOUT = "configuration_timeout"
 
 ENTRY_PRIMARY_KEY = CONF_NAME
 
@@ -23,26 +38,83 @@ PROTOCOLS = {True: "https", False: "http"}
 
 DOMAIN = "switcher_api"
 DATA = f"data_{DOMAIN}"
+DATA_POLL_SCHEDULER = "poll_scheduler"
+DATA_BROADCAST_LISTENER = "broadcast_listener"
+DATA_STORAGE = "storage"
 DEFAULT_NAME = "Switcher API"
 
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+# Seconds to wait for further changes before writing the snapshots
+STORAGE_SAVE_DELAY = 30
+
 CONF_AUTO_OFF = "auto-off"
 
 DOMAIN_LOGGER = "logger"
 SERVICE_SET_LEVEL = "set_level"
+SERVICE_REFRESH_SCHEDULES = "refresh_schedules"
 
 ATTR_FRIENDLY_NAME = "friendly_name"
-
-API_INTERVAL = timedelta(seconds=10)
-UPDATE_INTERVAL = timedelta(seconds=10)
-
-UPDATE_SIGNAL_SENSOR = f"{DOMAIN}_{DOMAIN_SENSOR}_UPDATE_SIGNAL"
-UPDATE_SIGNAL_SWITCH = f"{DOMAIN}_{DOMAIN_SWITCH}_UPDATE_SIGNAL"
+ATTR_DESCRIPTION = "description"
+ATTR_REQUESTS = "requests"
+ATTR_FAILURES = "failures"
+ATTR_TIMEOUTS = "timeouts"
+ATTR_RECONNECTS = "reconnects"
+
+DEFAULT_MIN_POLL_INTERVAL = 2
+DEFAULT_MAX_POLL_INTERVAL = 60
+DEFAULT_DEADBAND = "0"
+DEFAULT_MIN_WRITE_INTERVAL = 0
+DEFAULT_MAX_WRITE_INTERVAL = 300
+DEFAULT_SCHEDULES_INTERVAL = 3600
+DEFAULT_STATE_TIMEOUT = 5
+DEFAULT_SCHEDULES_TIMEOUT = 10
+DEFAULT_CONTROL_TIMEOUT = 10
+DEFAULT_CONFIGURATION_TIMEOUT = 10
+COMMAND_ACTIVITY_PERIOD = timedelta(seconds=60)
+
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_BASE_DELAY = timedelta(seconds=10)
+CIRCUIT_BREAKER_MAX_DELAY = timedelta(minutes=10)
+
+POLL_MAX_CONCURRENT = 4
+POLL_STAGGER = timedelta(milliseconds=500)
+
+STARTUP_PHASE_CONFIG = "config"
+STARTUP_PHASE_RESTORE = "restore"
+STARTUP_PHASE_PLATFORMS = "platforms"
+STARTUP_PHASE_FIRST_FETCH = "first_fetch"
+STARTUP_PHASE_FIRST_ENTITIES = "first_entities"
+
+QUEUE_PRIORITY_COMMAND = 0
+QUEUE_PRIORITY_POLL = 1
+QUEUE_DEADLINE_COMMAND = timedelta(seconds=30)
+QUEUE_DEADLINE_POLL = timedelta(seconds=10)
+QUEUE_KEY_CONTROL = "control"
+
+OPERATION_STATE = "state"
+OPERATION_SCHEDULES = "schedules"
+OPERATION_CONTROL = "control"
+OPERATION_CONFIGURATION = "configuration"
+
+REQUEST_STATS_WINDOW = 100
+REQUEST_STATS_PERCENTILES = [50, 95]
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half-open"
+SESSION_IDLE_TIMEOUT = timedelta(seconds=60)
+# Kept open beyond the slowest polling interval, so idle polls reuse the session
+SESSION_IDLE_MARGIN = timedelta(seconds=30)
+
+BROADCAST_PORT = 20002
+BROADCAST_MESSAGE_LENGTH = 165
+BROADCAST_PREFIX = b"\xfe\xf0"
+DEFAULT_FALLBACK_INTERVAL = 60
+
+UPDATE_SIGNAL = f"{DOMAIN}_{{}}_{{}}_UPDATE_SIGNAL"
 
 SUPPORTED_DOMAINS = [DOMAIN_SWITCH, DOMAIN_SENSOR]
-SIGNALS = {
-    DOMAIN_SENSOR: UPDATE_SIGNAL_SENSOR,
-    DOMAIN_SWITCH: UPDATE_SIGNAL_SWITCH,
-}
 
 ENTITY_ID = "id"
 ENTITY_NAME = "name"
@@ -54,6 +126,8 @@ ENTITY_DEVICE_CLASS = "device-class"
 ENTITY_DEVICE_NAME = "device-name"
 ENTITY_TYPE = "entity-type"
 ENTITY_DISABLED = "disabled"
+ENTITY_AVAILABLE = "available"
+ENTITY_UNIT_OF_MEASUREMENT = "unit-of-measurement"
 ENTITY_STATUS = "entity-status"
 ENTITY_STATUS_EMPTY = None
 ENTITY_STATUS_READY = f"{ENTITY_STATUS}-ready"
@@ -77,7 +151,6 @@ LOG_LEVELS = [
 ]
 
 KEY_DAYS = "days"
-KEY_ENABLED = "enabled"
 KEY_END_TIME = "end_time"
 KEY_FOUND_SCHEDULES = "found_schedules"
 KEY_RECURRING = "recurring"
@@ -87,3 +160,18 @@ KEY_STATE = "state"
 KEY_START_TIME = "start_time"
 KEY_SUCCESSFUL = "successful"
 KEY_AUTO_OFF = "auto_off"
+KEY_AUTO_SHUTDOWN = "auto_shutdown"
+KEY_TIME_LEFT = "time_left"
+KEY_TIME_ON = "time_on"
+KEY_POWER_CONSUMPTION = "power_consumption"
+KEY_ELECTRIC_CURRENT = "electric_current"
+
+# Counters ticking on every poll while the device is on, not worth a save
+STORAGE_TICKING_KEYS = [KEY_TIME_LEFT, KEY_TIME_ON]
+
+# Volatile state fields, exposed as sensors instead of main switch attributes
+STATE_SENSORS = {
+    KEY_TIME_LEFT: ["Remaining Time", "mdi:timer-sand"],
+    KEY_TIME_ON: ["Time On", "mdi:timer-outline"],
+    KEY_AUTO_SHUTDOWN: ["Auto Shutdown", "mdi:timer-off-outline"],
+}
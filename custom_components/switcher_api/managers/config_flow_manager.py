@@ -2,7 +2,6 @@ from datetime import datetime
 import logging
 from typing import Any, Dict, Optional
 
-from cryptography.fernet import InvalidToken
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
@@ -12,8 +11,9 @@ from .. import get_ha
 from ..api.switcher_api import SwitcherApi
 from ..helpers.const import *
 from ..managers.configuration_manager import ConfigManager
-from ..models import AutoOffError, LoginError
+from ..models import AutoOffError, DeadbandError, LoginError, PollIntervalError
 from ..models.config_data import ConfigData
+from .write_throttle import Deadband
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,6 +69,21 @@ class ConfigFlowManager:
         await self._update_entry()
 
         if flow == CONFIG_FLOW_OPTIONS:
+            min_poll_interval = self.config_data.min_poll_interval
+            max_poll_interval = self.config_data.max_poll_interval
+
+            if min_poll_interval > max_poll_interval:
+                raise PollIntervalError(
+                    min_poll_interval, max_poll_interval, "poll-interval-invalid"
+                )
+
+            for deadband in [
+                self.config_data.power_deadband,
+                self.config_data.current_deadband,
+            ]:
+                if not Deadband.is_valid(deadband):
+                    raise DeadbandError(deadband, "deadband-invalid")
+
             auto_off_str = options.get(CONF_AUTO_OFF)
 
             auto_off = datetime.strptime(auto_off_str, "%H:%M:%S")
@@ -133,6 +148,45 @@ class ConfigFlowManager:
             vol.Optional(CONF_LOG_LEVEL, default=config_data.log_level): vol.In(
                 LOG_LEVELS
             ),
+            vol.Optional(CONF_USE_BROADCAST, default=config_data.use_broadcast): bool,
+            vol.Optional(
+                CONF_FALLBACK_INTERVAL, default=config_data.fallback_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                CONF_MIN_POLL_INTERVAL, default=config_data.min_poll_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_MAX_POLL_INTERVAL, default=config_data.max_poll_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_DIAGNOSTIC_SENSORS, default=config_data.diagnostic_sensors
+            ): bool,
+            vol.Optional(CONF_STATE_SENSORS, default=config_data.state_sensors): bool,
+            vol.Optional(CONF_POWER_DEADBAND, default=config_data.power_deadband): str,
+            vol.Optional(
+                CONF_CURRENT_DEADBAND, default=config_data.current_deadband
+            ): str,
+            vol.Optional(
+                CONF_MIN_WRITE_INTERVAL, default=config_data.min_write_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_MAX_WRITE_INTERVAL, default=config_data.max_write_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_SCHEDULES_INTERVAL, default=config_data.schedules_interval
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+            vol.Optional(
+                CONF_STATE_TIMEOUT, default=config_data.state_timeout
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_SCHEDULES_TIMEOUT, default=config_data.schedules_timeout
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_CONTROL_TIMEOUT, default=config_data.control_timeout
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_CONFIGURATION_TIMEOUT, default=config_data.configuration_timeout
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
         }
 
         data_schema = vol.Schema(fields)
@@ -140,18 +194,9 @@ class ConfigFlowManager:
         return data_schema
 
     async def _update_entry(self):
-        try:
-            entry = ConfigEntry(
-                0, "", "", self._data, "", "", {}, options=self._options
-            )
+        entry = ConfigEntry(0, "", "", self._data, "", "", {}, options=self._options)
 
-            await self._config_manager.update(entry)
-        except InvalidToken:
-            entry = ConfigEntry(
-                0, "", "", self._data, "", "", {}, options=self._options
-            )
-
-            await self._config_manager.update(entry)
+        await self._config_manager.update(entry)
 
     @staticmethod
     async def _clone_items(user_input, flow: str):
@@ -200,7 +245,11 @@ class ConfigFlowManager:
         config_data = self._config_manager.data
 
         api = SwitcherApi(self._hass, self._config_manager)
-        state = await api.get_state()
+
+        try:
+            state = await api.get_state()
+        finally:
+            await api.async_close()
 
         if state is None:
             _LOGGER.warning(f"Failed to access Switcher ({config_data.ip_address})")
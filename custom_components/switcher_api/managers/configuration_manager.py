@@ -23,6 +23,39 @@ class ConfigManager:
         result.device_id = data.get(CONF_DEVICE_ID)
         result.ip_address = data.get(CONF_IP_ADDRESS)
         result.auto_off = options.get(CONF_AUTO_OFF)
+        result.use_broadcast = options.get(CONF_USE_BROADCAST, False)
+        result.fallback_interval = options.get(
+            CONF_FALLBACK_INTERVAL, DEFAULT_FALLBACK_INTERVAL
+        )
+        result.min_poll_interval = options.get(
+            CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+        )
+        result.max_poll_interval = options.get(
+            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+        )
+        result.diagnostic_sensors = options.get(CONF_DIAGNOSTIC_SENSORS, False)
+        result.state_sensors = options.get(CONF_STATE_SENSORS, False)
+        result.power_deadband = options.get(CONF_POWER_DEADBAND, DEFAULT_DEADBAND)
+        result.current_deadband = options.get(CONF_CURRENT_DEADBAND, DEFAULT_DEADBAND)
+        result.min_write_interval = options.get(
+            CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+        )
+        result.max_write_interval = options.get(
+            CONF_MAX_WRITE_INTERVAL, DEFAULT_MAX_WRITE_INTERVAL
+        )
+        result.schedules_interval = options.get(
+            CONF_SCHEDULES_INTERVAL, DEFAULT_SCHEDULES_INTERVAL
+        )
+        result.state_timeout = options.get(CONF_STATE_TIMEOUT, DEFAULT_STATE_TIMEOUT)
+        result.schedules_timeout = options.get(
+            CONF_SCHEDULES_TIMEOUT, DEFAULT_SCHEDULES_TIMEOUT
+        )
+        result.control_timeout = options.get(
+            CONF_CONTROL_TIMEOUT, DEFAULT_CONTROL_TIMEOUT
+        )
+        result.configuration_timeout = options.get(
+            CONF_CONFIGURATION_TIMEOUT, DEFAULT_CONFIGURATION_TIMEOUT
+        )
 
         self.config_entry = config_entry
         self.data = result
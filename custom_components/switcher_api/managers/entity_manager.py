@@ -1,17 +1,24 @@
+from datetime import timezone
 import logging
 import sys
 from typing import Dict, List, Optional
 
 from homeassistant.const import STATE_OFF, STATE_ON
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_registry import EntityRegistry
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED,
+    EntityRegistry,
+    RegistryEntry,
+)
 
 from ..api.switcher_api import SwitcherApi
 from ..helpers.const import *
 from ..models.config_data import ConfigData
 from ..models.entity_data import EntityData
+from ..models.state_data import StateData
 from .configuration_manager import ConfigManager
 from .device_manager import DeviceManager
+from .write_throttle import Deadband, WriteThrottle
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +29,13 @@ class EntityManager:
     entities: dict
     domain_component_manager: dict
     mqtt_states: dict
+    changed_entities: Dict[str, EntityData]
+    written_updates: int
+    skipped_updates: int
+    generated_entities: set
+    registry_entries: Dict[str, Optional[RegistryEntry]]
+    fingerprints: Dict[str, tuple]
+    write_throttle: WriteThrottle
 
     def __init__(self, hass, ha):
         self.hass = hass
@@ -29,6 +43,17 @@ class EntityManager:
         self.domain_component_manager = {}
         self.entities = {}
         self.mqtt_states = {}
+        self.changed_entities = {}
+        self.written_updates = 0
+        self.skipped_updates = 0
+        self.generated_entities = set()
+        self.registry_entries = {}
+        self.fingerprints = {}
+        self.write_throttle = WriteThrottle()
+
+        self._remove_registry_listener = self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, self._entity_registry_updated
+        )
 
     @property
     def entity_registry(self) -> EntityRegistry:
@@ -54,6 +79,53 @@ class EntityManager:
     def integration_title(self) -> str:
         return self.config_manager.config_entry.title
 
+    def async_remove(self):
+        if self._remove_registry_listener is not None:
+            self._remove_registry_listener()
+            self._remove_registry_listener = None
+
+        self.registry_entries.clear()
+
+    def get_registry_entry(self, domain, unique_id) -> Optional[RegistryEntry]:
+        if unique_id not in self.registry_entries:
+            entity_id = self.entity_registry.async_get_entity_id(
+                domain, DOMAIN, unique_id
+            )
+
+            entity_item = None
+            if entity_id is not None:
+                entity_item = self.entity_registry.async_get(entity_id)
+
+            self.registry_entries[unique_id] = entity_item
+
+        return self.registry_entries[unique_id]
+
+    @callback
+    def _entity_registry_updated(self, event: Event):
+        action = event.data.get("action")
+        entity_ids = [event.data.get("entity_id"), event.data.get("old_entity_id")]
+
+        if action == "create":
+            for unique_id in list(self.registry_entries):
+                if self.registry_entries[unique_id] is None:
+                    del self.registry_entries[unique_id]
+
+        for unique_id in list(self.registry_entries):
+            entity_item = self.registry_entries[unique_id]
+
+            if entity_item is not None and entity_item.entity_id in entity_ids:
+                del self.registry_entries[unique_id]
+
+                for entity in self.get_all_entities():
+                    if entity.unique_id == unique_id:
+                        entity_item = self.get_registry_entry(
+                            entity_item.domain, unique_id
+                        )
+
+                        entity.disabled = (
+                            entity_item is not None and entity_item.disabled
+                        )
+
     def set_domain_component(self, domain, async_add_entities, component):
         self.domain_component_manager[domain] = {
             "async_add_entities": async_add_entities,
@@ -108,12 +180,44 @@ class EntityManager:
 
     def delete_entity(self, domain, name):
         if domain in self.entities and name in self.entities[domain]:
-            del self.entities[domain][name]
+            entity = self.entities[domain].pop(name)
+
+            self.fingerprints.pop(entity.unique_id, None)
+            self.write_throttle.remove(entity.unique_id)
+
+    def get_or_create_entity(self, domain, name) -> EntityData:
+        """Existing entities are updated in place instead of being re-allocated."""
+        entity = self.get_entity(domain, name)
+
+        if entity is None:
+            entity = EntityData()
+
+        return entity
 
     def set_entity(self, domain, name, data: EntityData):
         try:
             self.check_domain(domain)
 
+            self.generated_entities.add(data.unique_id)
+
+            data.available = self.api.is_available
+
+            fingerprint = data.fingerprint
+
+            if self.fingerprints.get(data.unique_id) == fingerprint:
+                self.skipped_updates += 1
+                return
+
+            current = self.entities[domain].get(name)
+
+            if current is not None and current is not data:
+                data.status = current.status
+                data.disabled = current.disabled
+
+            self.written_updates += 1
+            self.changed_entities[data.unique_id] = data
+            self.fingerprints[data.unique_id] = fingerprint
+
             self.entities[domain][name] = data
         except Exception as ex:
             self.log_exception(
@@ -129,6 +233,13 @@ class EntityManager:
             self.generate_electric_current_sensor(state)
             self.generate_main_switch(state)
 
+            if self.config_data.state_sensors:
+                for key in STATE_SENSORS:
+                    self.generate_state_sensor(state, key)
+
+            if self.config_data.diagnostic_sensors:
+                self.generate_diagnostic_sensors()
+
             if schedules.get(KEY_FOUND_SCHEDULES, False):
                 all_schedules = schedules.get(KEY_SCHEDULES, [])
 
@@ -137,10 +248,7 @@ class EntityManager:
         except Exception as ex:
             self.log_exception(ex, "Failed to create_components")
 
-    def update(self):
-        self.hass.async_create_task(self._async_update())
-
-    async def _async_update(self):
+    async def async_update(self):
         step = "Mark as ignore"
         try:
             entities_to_delete = []
@@ -150,11 +258,28 @@ class EntityManager:
 
             step = "Create components"
 
+            written_updates = self.written_updates
+            skipped_updates = self.skipped_updates
+
+            self.generated_entities.clear()
+
             self.create_components()
 
+            entities_to_delete = [
+                unique_id
+                for unique_id in entities_to_delete
+                if unique_id not in self.generated_entities
+            ]
+
+            _LOGGER.debug(
+                f"Entities updated: {self.written_updates - written_updates}, "
+                f"unchanged: {self.skipped_updates - skipped_updates}, "
+                f"held sensor changes: {self.write_throttle.held_changes}"
+            )
+
             step = "Start updating"
 
-            for domain in SIGNALS:
+            for domain in SUPPORTED_DOMAINS:
                 step = f"Start updating domain {domain}"
 
                 entities_to_add = []
@@ -169,15 +294,9 @@ class EntityManager:
 
                     entity = entities[entity_key]
 
-                    entity_id = self.entity_registry.async_get_entity_id(
-                        domain, DOMAIN, entity.unique_id
-                    )
-
                     if entity.status == ENTITY_STATUS_CREATED:
-                        entity_item = self.entity_registry.async_get(entity_id)
-
-                        if entity.unique_id in entities_to_delete:
-                            entities_to_delete.remove(entity.unique_id)
+                        entity_item = self.get_registry_entry(domain, entity.unique_id)
+                        entity_id = None if entity_item is None else entity_item.entity_id
 
                         step = f"Mark as created - {domain} -> {entity_key}"
 
@@ -219,7 +338,7 @@ class EntityManager:
             if len(entities_to_delete) > 0:
                 _LOGGER.info(f"Following items will be deleted: {entities_to_delete}")
 
-                for domain in SIGNALS:
+                for domain in SUPPORTED_DOMAINS:
                     entities = dict(self.get_entities(domain))
 
                     for entity_key in entities:
@@ -230,7 +349,20 @@ class EntityManager:
         except Exception as ex:
             self.log_exception(ex, f"Failed to update, step: {step}")
 
-    def get_power_consumption_sensor(self, state) -> EntityData:
+    def get_throttled_value(self, unique_id: str, value, deadband: Deadband):
+        config_data = self.config_data
+
+        throttled_value = self.write_throttle.get_value(
+            unique_id,
+            value,
+            deadband,
+            config_data.min_write_interval,
+            config_data.max_write_interval,
+        )
+
+        return throttled_value
+
+    def get_power_consumption_sensor(self, state: StateData) -> EntityData:
         entity = None
 
         try:
@@ -240,10 +372,14 @@ class EntityManager:
 
             unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{entity_name}"
 
-            state = state.get("power_consumption")
+            deadband = Deadband.parse(self.config_data.power_deadband)
+            state = self.get_throttled_value(
+                unique_id, state.power_consumption, deadband
+            )
+
             attributes = {ATTR_FRIENDLY_NAME: entity_name}
 
-            entity = EntityData()
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
 
             entity.unique_id = unique_id
             entity.name = entity_name
@@ -251,6 +387,7 @@ class EntityManager:
             entity.attributes = attributes
             entity.device_name = device_name
             entity.device_class = "power"
+            entity.unit_of_measurement = "w"
         except Exception as ex:
             self.log_exception(ex, "Failed to get power consumption sensor")
 
@@ -265,7 +402,7 @@ class EntityManager:
         except Exception as ex:
             self.log_exception(ex, "Failed to generate power consumption sensor")
 
-    def get_electric_current_sensor(self, state) -> EntityData:
+    def get_electric_current_sensor(self, state: StateData) -> EntityData:
         entity = None
 
         try:
@@ -275,10 +412,14 @@ class EntityManager:
 
             unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{entity_name}"
 
-            state = state.get("electric_current")
+            deadband = Deadband.parse(self.config_data.current_deadband)
+            state = self.get_throttled_value(
+                unique_id, state.electric_current, deadband
+            )
+
             attributes = {ATTR_FRIENDLY_NAME: entity_name}
 
-            entity = EntityData()
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
 
             entity.unique_id = unique_id
             entity.name = entity_name
@@ -286,6 +427,7 @@ class EntityManager:
             entity.attributes = attributes
             entity.device_name = device_name
             entity.device_class = "current"
+            entity.unit_of_measurement = "A"
         except Exception as ex:
             self.log_exception(ex, "Failed to get electric current sensor")
 
@@ -300,7 +442,167 @@ class EntityManager:
         except Exception as ex:
             self.log_exception(ex, "Failed to generate electric current sensor")
 
-    def get_main_switch(self, state_data) -> EntityData:
+    def get_state_sensor(self, state_data: StateData, key: str) -> EntityData:
+        entity = None
+
+        try:
+            name, icon = STATE_SENSORS[key]
+
+            entity_name = f"{self.integration_title} {name}"
+
+            device_name = self.device_manager.get_device_name()
+
+            unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{self.api.device_id}-{key}"
+
+            attributes = {ATTR_FRIENDLY_NAME: entity_name}
+
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
+
+            entity.unique_id = unique_id
+            entity.name = entity_name
+            entity.state = getattr(state_data, key)
+            entity.attributes = attributes
+            entity.icon = icon
+            entity.device_name = device_name
+        except Exception as ex:
+            self.log_exception(ex, f"Failed to get {key} sensor")
+
+        return entity
+
+    def generate_state_sensor(self, state_data: StateData, key: str):
+        try:
+            entity = self.get_state_sensor(state_data, key)
+            entity_name = entity.name
+
+            self.set_entity(DOMAIN_SENSOR, entity_name, entity)
+        except Exception as ex:
+            self.log_exception(ex, f"Failed to generate {key} sensor")
+
+    def get_latency_sensor(self) -> EntityData:
+        entity = None
+
+        try:
+            entity_name = f"{self.integration_title} Request Latency"
+
+            device_name = self.device_manager.get_device_name()
+
+            unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{self.api.device_id}-request-latency"
+
+            stats = self.api.stats
+
+            attributes = {ATTR_FRIENDLY_NAME: entity_name}
+
+            for percentile in REQUEST_STATS_PERCENTILES:
+                attributes[f"p{percentile}"] = to_milliseconds(
+                    stats.get_latency(percentile)
+                )
+
+            latency_summary = stats.get_latency_summary()
+
+            for key in latency_summary:
+                attributes[key] = to_milliseconds(latency_summary[key])
+
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
+
+            entity.unique_id = unique_id
+            entity.name = entity_name
+            entity.state = attributes["p50"]
+            entity.attributes = attributes
+            entity.icon = "mdi:timer-outline"
+            entity.device_name = device_name
+            entity.unit_of_measurement = "ms"
+        except Exception as ex:
+            self.log_exception(ex, "Failed to get request latency sensor")
+
+        return entity
+
+    def get_success_ratio_sensor(self) -> EntityData:
+        entity = None
+
+        try:
+            entity_name = f"{self.integration_title} Request Success Ratio"
+
+            device_name = self.device_manager.get_device_name()
+
+            unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{self.api.device_id}-request-success-ratio"
+
+            stats = self.api.stats
+            success_ratio = stats.success_ratio
+
+            state = None if success_ratio is None else round(success_ratio * 100, 1)
+
+            attributes = {
+                ATTR_FRIENDLY_NAME: entity_name,
+                ATTR_REQUESTS: stats.requests,
+                ATTR_FAILURES: stats.failures,
+                ATTR_TIMEOUTS: stats.timeouts,
+                ATTR_RECONNECTS: self.api.session.reconnects,
+            }
+
+            for operation in stats.operation_timeouts:
+                attributes[f"{operation}_{ATTR_TIMEOUTS}"] = stats.operation_timeouts[
+                    operation
+                ]
+
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
+
+            entity.unique_id = unique_id
+            entity.name = entity_name
+            entity.state = state
+            entity.attributes = attributes
+            entity.icon = "mdi:check-network-outline"
+            entity.device_name = device_name
+            entity.unit_of_measurement = "%"
+        except Exception as ex:
+            self.log_exception(ex, "Failed to get request success ratio sensor")
+
+        return entity
+
+    def get_last_poll_sensor(self) -> EntityData:
+        entity = None
+
+        try:
+            entity_name = f"{self.integration_title} Last Successful Poll"
+
+            device_name = self.device_manager.get_device_name()
+
+            unique_id = f"{DOMAIN}-{DOMAIN_SENSOR}-{self.api.device_id}-last-successful-poll"
+
+            last_successful_poll = self.api.stats.last_successful_poll
+
+            state = None
+            if last_successful_poll is not None:
+                state = last_successful_poll.replace(tzinfo=timezone.utc).isoformat()
+
+            attributes = {ATTR_FRIENDLY_NAME: entity_name}
+
+            entity = self.get_or_create_entity(DOMAIN_SENSOR, entity_name)
+
+            entity.unique_id = unique_id
+            entity.name = entity_name
+            entity.state = state
+            entity.attributes = attributes
+            entity.device_name = device_name
+            entity.device_class = "timestamp"
+        except Exception as ex:
+            self.log_exception(ex, "Failed to get last successful poll sensor")
+
+        return entity
+
+    def generate_diagnostic_sensors(self):
+        try:
+            entities = [
+                self.get_latency_sensor(),
+                self.get_success_ratio_sensor(),
+                self.get_last_poll_sensor(),
+            ]
+
+            for entity in entities:
+                self.set_entity(DOMAIN_SENSOR, entity.name, entity)
+        except Exception as ex:
+            self.log_exception(ex, "Failed to generate diagnostic sensors")
+
+    def get_main_switch(self, state_data: StateData) -> EntityData:
         entity = None
 
         try:
@@ -309,15 +611,16 @@ class EntityManager:
             entity_name = f"{self.integration_title}"
             unique_id = f"{DOMAIN}-{DOMAIN_SWITCH}-{entity_name}"
 
-            state = state_data.get(KEY_STATE, STATE_OFF) == STATE_ON
+            state = str(state_data.get(KEY_STATE, STATE_OFF)).lower() == STATE_ON
 
             attributes = {ATTR_FRIENDLY_NAME: entity_name}
 
-            for key in state_data:
-                if key not in [KEY_STATE, KEY_SUCCESSFUL]:
-                    attributes[key] = state_data[key]
+            if not self.config_data.state_sensors:
+                for key in StateData._fields:
+                    if key != KEY_STATE:
+                        attributes[key] = getattr(state_data, key)
 
-            entity = EntityData()
+            entity = self.get_or_create_entity(DOMAIN_SWITCH, entity_name)
 
             entity.unique_id = unique_id
             entity.name = entity_name
@@ -360,19 +663,23 @@ class EntityManager:
             if schedule_recurring:
                 schedule_description = f"Recurring - {schedule_description}"
 
-            entity_name = f"{self.integration_title} Schedule #{schedule_id} - {schedule_description}"
+            entity_name = f"{self.integration_title} Schedule #{schedule_id}"
 
-            unique_id = f"{DOMAIN}-{DOMAIN_SWITCH}-{entity_name}"
+            unique_id = get_schedule_unique_id(self.api.device_id, schedule_id)
 
-            state = schedule_item.get(KEY_ENABLED, False)
+            # aioswitcher reports no enabled flag, the device returns only
+            # the schedules it runs
+            state = True
 
-            attributes = {ATTR_FRIENDLY_NAME: entity_name}
+            attributes = {
+                ATTR_FRIENDLY_NAME: entity_name,
+                ATTR_DESCRIPTION: schedule_description,
+            }
 
             for key in schedule_item:
-                if key != KEY_ENABLED:
-                    attributes[key] = schedule_item[key]
+                attributes[key] = schedule_item[key]
 
-            entity = EntityData()
+            entity = self.get_or_create_entity(DOMAIN_SWITCH, entity_name)
 
             entity.id = schedule_id
             entity.unique_id = unique_id
@@ -383,7 +690,7 @@ class EntityManager:
             entity.device_name = device_name
             entity.type = SWITCH_SCHEDULE
         except Exception as ex:
-            self.log_exception(ex, "Failed to get main switch")
+            self.log_exception(ex, "Failed to get schedule switch")
 
         return entity
 
@@ -404,3 +711,11 @@ class EntityManager:
         line_number = tb.tb_lineno
 
         _LOGGER.error(f"{message}, Error: {str(ex)}, Line: {line_number}")
+
+
+def get_schedule_unique_id(device_id: str, schedule_id) -> str:
+    return f"{DOMAIN}-{DOMAIN_SWITCH}-{device_id}-schedule-{schedule_id}"
+
+
+def to_milliseconds(latency: Optional[float]) -> Optional[int]:
+    return None if latency is None else round(latency * 1000)
@@ -3,41 +3,47 @@ Support for Switcher.
 For more details about this platform, please refer to the documentation at
 https://home-assistant.io/components/switcher/
 """
+import asyncio
 import logging
+import re
 import sys
-from typing import Optional
-
-from cryptography.fernet import InvalidToken
+import time as timer
+from typing import Dict, Optional
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_registry import (
     EntityRegistry,
+    async_entries_for_config_entry,
     async_get_registry as er_async_get_registry,
 )
-from homeassistant.helpers.event import async_track_time_interval
 
 from ..api.switcher_api import SwitcherApi
 from ..helpers.const import *
 from ..models.config_data import ConfigData
 from .configuration_manager import ConfigManager
 from .device_manager import DeviceManager
-from .entity_manager import EntityManager
+from .entity_manager import EntityManager, get_schedule_unique_id
+from .poll_scheduler import PollScheduler
+from .storage_manager import StorageManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Schedule switch unique ID up to v1.1.1, "<title> Schedule #<id> - <description>"
+LEGACY_SCHEDULE_UNIQUE_ID = re.compile(
+    rf"^{DOMAIN}-{DOMAIN_SWITCH}-.+ Schedule #(\d+) - .+$"
+)
+
 
 class HomeAssistantManager:
     def __init__(self, hass: HomeAssistant):
         self._hass = hass
 
-        self._remove_async_track_time_entities = None
-        self._remove_async_track_time_schedule = None
-        self._remove_async_track_time_state = None
-
         self._is_initialized = False
         self._is_updating = False
+        self._is_refreshing = False
+        self._data_version = None
 
         self._entity_registry = None
 
@@ -49,6 +55,9 @@ class HomeAssistantManager:
 
         self._integration_name = None
 
+        self._started = None
+        self._startup_timings: Dict[str, float] = {}
+
     @property
     def api(self) -> SwitcherApi:
         return self._api
@@ -69,6 +78,19 @@ class HomeAssistantManager:
     def config_manager(self) -> ConfigManager:
         return self._config_manager
 
+    @property
+    def poll_scheduler(self) -> PollScheduler:
+        return self._hass.data[DATA][DATA_POLL_SCHEDULER]
+
+    @property
+    def storage_manager(self) -> StorageManager:
+        return self._hass.data[DATA][DATA_STORAGE]
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
+        """Seconds from the start of the setup to the end of every startup phase."""
+        return self._startup_timings
+
     @property
     def config_data(self) -> Optional[ConfigData]:
         if self._config_manager is not None:
@@ -80,27 +102,24 @@ class HomeAssistantManager:
         try:
             _LOGGER.debug("Starting async_init")
 
+            self._started = timer.perf_counter()
+
             await self._config_manager.update(entry)
 
             self._integration_name = entry.title
 
             self._api = SwitcherApi(self._hass, self._config_manager)
+            self._api.on_state_changed = self._api_state_changed
             self._entity_manager = EntityManager(self._hass, self)
             self._device_manager = DeviceManager(self._hass, self)
 
             self._entity_registry = await er_async_get_registry(self._hass)
 
-            self._hass.loop.create_task(self._async_init())
-        except InvalidToken:
-            error_message = "Encryption key got corrupted, please remove the integration and re-add it"
+            self._migrate_schedule_switches()
 
-            _LOGGER.error(error_message)
+            self._set_startup_timing(STARTUP_PHASE_CONFIG)
 
-            await self._hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {"title": DEFAULT_NAME, "message": error_message},
-            )
+            self._hass.loop.create_task(self._async_init())
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -108,37 +127,170 @@ class HomeAssistantManager:
 
             _LOGGER.error(f"Failed to async_init, error: {ex}, line: {line_number}")
 
+    def _migrate_schedule_switches(self):
+        """Move schedule switches registered by their description to the schedule ID."""
+        registry = self._entity_registry
+        entry_id = self._config_manager.config_entry.entry_id
+
+        for entity_item in async_entries_for_config_entry(registry, entry_id):
+            match = LEGACY_SCHEDULE_UNIQUE_ID.match(entity_item.unique_id)
+
+            if entity_item.domain != DOMAIN_SWITCH or match is None:
+                continue
+
+            unique_id = get_schedule_unique_id(self.api.device_id, match.group(1))
+            entity_id = registry.async_get_entity_id(DOMAIN_SWITCH, DOMAIN, unique_id)
+
+            if entity_id is None:
+                _LOGGER.info(f"Migrating {entity_item.entity_id} to {unique_id}")
+
+                registry.async_update_entity(
+                    entity_item.entity_id, new_unique_id=unique_id
+                )
+
+            else:
+                _LOGGER.info(f"Removing {entity_item.entity_id}, replaced by {entity_id}")
+
+                registry.async_remove(entity_item.entity_id)
+
     async def _async_init(self):
+        """Forward all platforms concurrently while the device is fetched.
+
+        Entities are created right after the platforms are set up from the
+        stored snapshot (or from the fetched data when it was faster), then
+        updated once the first fetch completes.
+        """
+        entry = self._config_manager.config_entry
         load = self._hass.config_entries.async_forward_entry_setup
 
-        for domain in SIGNALS:
-            await load(self._config_manager.config_entry, domain)
+        await self._async_restore()
+
+        self._set_startup_timing(STARTUP_PHASE_RESTORE)
+
+        fetch_task = self._hass.async_create_task(self._async_first_fetch())
+
+        await asyncio.gather(*[load(entry, domain) for domain in SUPPORTED_DOMAINS])
+
+        self._set_startup_timing(STARTUP_PHASE_PLATFORMS)
 
         self._is_initialized = True
 
+        if self.api.data_version > 0:
+            await self._async_update()
+
+            self._set_startup_timing(STARTUP_PHASE_FIRST_ENTITIES)
+
+        await fetch_task
+
+        if self.api.data_version != self._data_version:
+            await self._async_update()
+
+        if STARTUP_PHASE_FIRST_ENTITIES not in self._startup_timings:
+            self._set_startup_timing(STARTUP_PHASE_FIRST_ENTITIES)
+
+        await self.api.async_update_listener()
+
         await self.async_update_entry()
 
-    def async_update_api(self, now):
+        timings = ", ".join(
+            f"{phase}: {self._startup_timings[phase]:.3f}s"
+            for phase in self._startup_timings
+        )
+
+        _LOGGER.info(f"Startup of {entry.title} completed, {timings}")
+
+    async def _async_restore(self):
+        """Start from the stored snapshot, the first fetch reconciles it."""
+        await self.storage_manager.async_load()
+
+        entry_id = self._config_manager.config_entry.entry_id
+        snapshot = self.storage_manager.get(entry_id)
+
+        if snapshot is None or not snapshot.state:
+            return
+
+        _LOGGER.debug(f"Restoring snapshot saved at {snapshot.saved}")
+
+        self.api.restore(snapshot.state, snapshot.schedules)
+
+    async def _async_first_fetch(self):
         try:
-            self._hass.async_create_task(self.api.async_update())
+            await self.poll_scheduler.async_run(self.api.async_update)
+
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
             line_number = tb.tb_lineno
 
             _LOGGER.error(
-                f"Failed to create task for update API state @{now}, error: {ex}, line: {line_number}"
+                f"Failed to fetch on startup, Error: {ex}, Line: {line_number}"
             )
 
-    def async_update(self, now):
+        self._set_startup_timing(STARTUP_PHASE_FIRST_FETCH)
+
+    def _set_startup_timing(self, phase: str):
+        self._startup_timings[phase] = timer.perf_counter() - self._started
+
+    @callback
+    def _api_state_changed(self):
+        self._hass.async_create_task(self._async_update())
+
+        self.poll_scheduler.reschedule(self._config_manager.config_entry.entry_id)
+
+    async def async_refresh(self):
+        await self._async_refresh()
+
+    async def async_refresh_schedules(self):
+        if not self._is_initialized:
+            _LOGGER.info("NOT INITIALIZED - Failed refreshing schedules")
+            return
+
+        await self.api.async_update_schedules()
+
+    def has_entity(self, entity_ids) -> bool:
+        entry_id = self._config_manager.config_entry.entry_id
+
+        for entity_id in entity_ids:
+            entity_item = self._entity_registry.async_get(entity_id)
+
+            if entity_item is not None and entity_item.config_entry_id == entry_id:
+                return True
+
+        return False
+
+    async def _async_refresh(self):
+        """Fetch from the device, then rebuild and dispatch only when data changed."""
+        if not self._is_initialized:
+            _LOGGER.info("NOT INITIALIZED - Failed refreshing")
+            return
+
+        if self._is_refreshing:
+            _LOGGER.debug("Skip refreshing")
+            return
+
+        self._is_refreshing = True
+
         try:
-            self._hass.async_create_task(self._async_update())
+            await self.api.async_update()
+
+            # Diagnostic sensors reflect every request, not only data changes,
+            # held sensor changes are written once their interval passed
+            is_changed = self.api.data_version != self._data_version
+            is_diagnostic = self.config_data.diagnostic_sensors
+            has_held_changes = self.entity_manager.write_throttle.has_pending
+
+            if is_changed or is_diagnostic or has_held_changes:
+                await self._async_update()
+            else:
+                _LOGGER.debug("Skip updating entities, no new data")
+
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
             line_number = tb.tb_lineno
 
-            _LOGGER.error(
-                f"Failed to create task for update entities @{now}, error: {ex}, line: {line_number}"
-            )
+            _LOGGER.error(f"Failed to async_refresh, Error: {ex}, Line: {line_number}")
+
+        finally:
+            self._is_refreshing = False
 
     async def _async_update(self):
         if not self._is_initialized:
@@ -154,6 +306,8 @@ class HomeAssistantManager:
 
             self._is_updating = True
 
+            data_version = self.api.data_version
+
             title = self._config_manager.config_entry.title
 
             if self._integration_name != self._config_manager.config_entry.title:
@@ -163,9 +317,18 @@ class HomeAssistantManager:
                     self._integration_name = title
 
             self.device_manager.update()
-            self.entity_manager.update()
+            await self.entity_manager.async_update()
 
             self.dispatch_all()
+
+            if self._data_version != data_version:
+                entry_id = self._config_manager.config_entry.entry_id
+
+                self.storage_manager.update(
+                    entry_id, self.api.state, self.api.schedules
+                )
+
+            self._data_version = data_version
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
             line_number = tb.tb_lineno
@@ -180,14 +343,6 @@ class HomeAssistantManager:
         if not update_config_manager:
             entry = self._config_manager.config_entry
 
-            self._remove_async_track_time_state = async_track_time_interval(
-                self._hass, self.async_update_api, API_INTERVAL
-            )
-
-            self._remove_async_track_time_entities = async_track_time_interval(
-                self._hass, self.async_update, UPDATE_INTERVAL
-            )
-
         if not self._is_initialized:
             _LOGGER.info(
                 f"NOT INITIALIZED - Failed handling ConfigEntry change: {entry.as_dict()}"
@@ -205,30 +360,33 @@ class HomeAssistantManager:
             if current_auto_off is None:
                 self.config_data.auto_off = state_auto_off
 
-        await self._async_update()
+            await self.api.async_update_listener()
+
+            await self._async_update()
+
+            self.poll_scheduler.reschedule(entry.entry_id)
+
+        else:
+            self.poll_scheduler.register(entry.entry_id, self, True)
 
     async def async_remove(self, entry: ConfigEntry):
         _LOGGER.info(f"Removing current integration - {entry.title}")
 
-        if self._remove_async_track_time_entities is not None:
-            self._remove_async_track_time_entities()
-            self._remove_async_track_time_entities = None
-
-        if self._remove_async_track_time_state is not None:
-            self._remove_async_track_time_state()
-            self._remove_async_track_time_state = None
+        self._is_initialized = False
 
-        if self._remove_async_track_time_schedule is not None:
-            self._remove_async_track_time_schedule()
-            self._remove_async_track_time_schedule = None
+        self.poll_scheduler.unregister(entry.entry_id)
 
         unload = self._hass.config_entries.async_forward_entry_unload
 
         for domain in SUPPORTED_DOMAINS:
             await unload(entry, domain)
 
+        self._entity_manager.async_remove()
+
         await self._device_manager.async_remove()
 
+        await self._api.async_close()
+
         _LOGGER.info(f"Current integration ({entry.title}) removed")
 
     async def delete_entity(self, domain, name):
@@ -259,7 +417,12 @@ class HomeAssistantManager:
             _LOGGER.info("NOT INITIALIZED - Failed discovering components")
             return
 
-        for domain in SUPPORTED_DOMAINS:
-            signal = SIGNALS.get(domain)
+        entry_id = self._config_manager.config_entry.entry_id
+        changed_entities = self.entity_manager.changed_entities
+
+        for unique_id in changed_entities:
+            signal = UPDATE_SIGNAL.format(entry_id, unique_id)
+
+            async_dispatcher_send(self._hass, signal, changed_entities[unique_id])
 
-            async_dispatcher_send(self._hass, signal)
+        changed_entities.clear()
@@ -0,0 +1,167 @@
+"""Domain level scheduler for polling all Switcher devices."""
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from typing import Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from ..helpers.const import *
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """Polls every config entry on its own interval using a single timer.
+
+    Polls are staggered when entries are registered and keep their phase
+    afterwards, device I/O is bounded by a semaphore shared by all entries.
+    """
+
+    cycles: int
+    last_cycle_polls: int
+    last_cycle_duration: float
+    max_cycle_duration: float
+    max_lag: float
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+
+        self._managers: Dict[str, object] = {}
+        self._next_poll: Dict[str, datetime] = {}
+        self._polling = set()
+        self._semaphore = asyncio.Semaphore(POLL_MAX_CONCURRENT)
+        self._remove_timer = None
+
+        self.cycles = 0
+        self.last_cycle_polls = 0
+        self.last_cycle_duration = 0
+        self.max_cycle_duration = 0
+        self.max_lag = 0
+
+    def register(self, entry_id: str, ha, is_fetched: bool = False):
+        """Start polling an entry, staggered, a full interval later when it was just fetched."""
+        offset = POLL_STAGGER.total_seconds() * len(self._managers)
+        interval = ha.api.get_poll_interval().total_seconds()
+
+        if interval > 0:
+            offset = offset % interval
+
+        if is_fetched:
+            offset += interval
+
+        self._managers[entry_id] = ha
+        self._next_poll[entry_id] = datetime.utcnow() + timedelta(seconds=offset)
+
+        self._schedule()
+
+    async def async_run(self, action):
+        """Run a request outside of the poll cycle, bounded by the shared semaphore."""
+        async with self._semaphore:
+            await action()
+
+    def unregister(self, entry_id: str):
+        self._managers.pop(entry_id, None)
+        self._next_poll.pop(entry_id, None)
+
+        self._schedule()
+
+    def reschedule(self, entry_id: str):
+        ha = self._managers.get(entry_id)
+
+        if ha is None or entry_id in self._polling:
+            return
+
+        next_poll = datetime.utcnow() + ha.api.get_poll_interval()
+
+        if next_poll < self._next_poll[entry_id]:
+            self._next_poll[entry_id] = next_poll
+
+            self._schedule()
+
+    def _schedule(self):
+        if self._remove_timer is not None:
+            self._remove_timer()
+            self._remove_timer = None
+
+        next_polls = [
+            self._next_poll[entry_id]
+            for entry_id in self._next_poll
+            if entry_id not in self._polling
+        ]
+
+        if len(next_polls) == 0:
+            return
+
+        delay = (min(next_polls) - datetime.utcnow()).total_seconds()
+
+        self._remove_timer = async_call_later(self._hass, max(delay, 0), self._tick)
+
+    @callback
+    def _tick(self, now):
+        self._remove_timer = None
+
+        utc_now = datetime.utcnow()
+
+        due_entries = [
+            entry_id
+            for entry_id in self._next_poll
+            if entry_id not in self._polling and self._next_poll[entry_id] <= utc_now
+        ]
+
+        self._polling.update(due_entries)
+
+        if len(due_entries) > 0:
+            self._hass.async_create_task(self._async_run_cycle(due_entries))
+
+        self._schedule()
+
+    async def _async_run_cycle(self, entry_ids: List[str]):
+        started = datetime.utcnow()
+
+        await asyncio.gather(
+            *[self._async_poll(entry_id) for entry_id in entry_ids],
+            return_exceptions=True,
+        )
+
+        duration = (datetime.utcnow() - started).total_seconds()
+
+        self.cycles += 1
+        self.last_cycle_polls = len(entry_ids)
+        self.last_cycle_duration = duration
+        self.max_cycle_duration = max(self.max_cycle_duration, duration)
+
+        _LOGGER.debug(
+            f"Poll cycle #{self.cycles} completed, Devices: {len(entry_ids)}, "
+            f"Duration: {duration:.3f}s, Max duration: {self.max_cycle_duration:.3f}s, "
+            f"Max lag: {self.max_lag:.3f}s"
+        )
+
+    async def _async_poll(self, entry_id: str):
+        ha = self._managers.get(entry_id)
+        scheduled: Optional[datetime] = self._next_poll.get(entry_id)
+
+        try:
+            if ha is not None:
+                async with self._semaphore:
+                    lag = (datetime.utcnow() - scheduled).total_seconds()
+                    self.max_lag = max(self.max_lag, lag)
+
+                    await ha.async_refresh()
+
+        finally:
+            self._polling.discard(entry_id)
+
+            if entry_id in self._managers:
+                interval = ha.api.get_poll_interval()
+                now = datetime.utcnow()
+
+                next_poll = scheduled + interval
+
+                if next_poll <= now:
+                    next_poll = now + interval
+
+                self._next_poll[entry_id] = next_poll
+
+            self._schedule()
@@ -0,0 +1,101 @@
+"""Persistence of the last known state and schedules of all devices."""
+import asyncio
+from datetime import datetime
+import logging
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from ..helpers.const import *
+from ..models.state_data import StateData
+from ..models.storage_data import StorageData, StorageDeviceData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StorageManager:
+    """Keeps a snapshot per config entry in a single store.
+
+    Saves are delayed, so changes of all devices within the delay are
+    written together, pending changes are written on shutdown. Further
+    changes do not postpone a pending save, so a snapshot is written at
+    most STORAGE_SAVE_DELAY seconds after it changed.
+    """
+
+    saves: int
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data = StorageData()
+        self._is_loaded = False
+        self._is_save_pending = False
+        self._lock = asyncio.Lock()
+
+        self.saves = 0
+
+    async def async_load(self):
+        async with self._lock:
+            if self._is_loaded:
+                return
+
+            data = await self._store.async_load()
+
+            self._data = StorageData.from_dict(data)
+            self._is_loaded = True
+
+            _LOGGER.debug(f"Loaded snapshots of {len(self._data.devices)} devices")
+
+    def get(self, entry_id: str) -> Optional[StorageDeviceData]:
+        return self._data.devices.get(entry_id)
+
+    def update(self, entry_id: str, state: StateData, schedules: dict):
+        device = self._data.devices.get(entry_id)
+
+        if device is None:
+            device = StorageDeviceData()
+
+            self._data.devices[entry_id] = device
+
+        state_data = state._asdict()
+        compared_state = self._get_compared_state(state_data)
+        is_state_changed = self._get_compared_state(device.state) != compared_state
+        is_changed = is_state_changed or device.schedules != schedules
+
+        device.state = state_data
+        device.schedules = schedules
+
+        if is_changed:
+            device.saved = datetime.utcnow().isoformat()
+
+            self._schedule_save()
+
+    def remove(self, entry_id: str):
+        if self._data.devices.pop(entry_id, None) is not None:
+            self._schedule_save()
+
+    @staticmethod
+    def _get_compared_state(state_data: dict) -> dict:
+        return {
+            key: value
+            for key, value in state_data.items()
+            if key not in STORAGE_TICKING_KEYS
+        }
+
+    def _schedule_save(self):
+        # async_delay_save restarts its timer, calling it again would keep
+        # postponing the save for as long as the devices keep changing
+        if self._is_save_pending:
+            return
+
+        self._is_save_pending = True
+
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._is_save_pending = False
+        self.saves += 1
+
+        return self._data.to_dict()
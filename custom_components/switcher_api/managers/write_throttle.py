@@ -0,0 +1,133 @@
+"""Deadband and rate limit for the state written by measurement sensors."""
+from datetime import datetime
+import re
+from typing import Dict, NamedTuple, Optional, Set, Tuple, Union
+
+DEADBAND_PATTERN = re.compile(r"^\s*(\d+(\.\d+)?)\s*(%?)\s*$")
+
+Number = Union[int, float]
+
+
+class Deadband(NamedTuple):
+    value: float
+    is_percent: bool
+
+    @staticmethod
+    def is_valid(deadband: Optional[str]) -> bool:
+        return DEADBAND_PATTERN.match(str(deadband)) is not None
+
+    @staticmethod
+    def parse(deadband: Optional[str]):
+        """Parse an absolute ("50") or relative ("5%") deadband, invalid values disable it."""
+        match = DEADBAND_PATTERN.match(str(deadband))
+
+        if match is None:
+            return Deadband(0, False)
+
+        return Deadband(float(match.group(1)), match.group(3) == "%")
+
+    def is_exceeded(self, previous: Number, current: Number) -> bool:
+        change = abs(current - previous)
+
+        if self.is_percent:
+            threshold = abs(previous) * self.value / 100
+        else:
+            threshold = self.value
+
+        return change >= threshold
+
+
+class WriteThrottle:
+    """Holds back insignificant changes of a sensor value.
+
+    A change is written when it exceeds the deadband, at most once per
+    minimum interval. Held changes are written once the maximum interval
+    passed, switching between zero and non-zero (device turned on / off)
+    is always written immediately.
+    """
+
+    written_changes: int
+    held_changes: int
+
+    def __init__(self):
+        self._written: Dict[str, Tuple[Optional[Number], datetime]] = {}
+        self._pending: Set[str] = set()
+
+        self.written_changes = 0
+        self.held_changes = 0
+
+    @property
+    def has_pending(self) -> bool:
+        return len(self._pending) > 0
+
+    def remove(self, unique_id: str):
+        self._written.pop(unique_id, None)
+        self._pending.discard(unique_id)
+
+    def get_value(
+        self,
+        unique_id: str,
+        value: Optional[Number],
+        deadband: Deadband,
+        min_interval: int,
+        max_interval: int,
+    ) -> Optional[Number]:
+        """Return the value to write, the last written one while the change is held."""
+        now = datetime.utcnow()
+        written = self._written.get(unique_id)
+
+        if written is None:
+            self._written[unique_id] = value, now
+
+            return value
+
+        written_value, written_at = written
+
+        if value == written_value:
+            self._pending.discard(unique_id)
+
+            return written_value
+
+        is_significant = self._is_significant(
+            written_value, written_at, value, deadband, now, min_interval, max_interval
+        )
+
+        if is_significant:
+            self._written[unique_id] = value, now
+            self._pending.discard(unique_id)
+
+            self.written_changes += 1
+
+            return value
+
+        self._pending.add(unique_id)
+
+        self.held_changes += 1
+
+        return written_value
+
+    @staticmethod
+    def _is_significant(
+        written_value: Optional[Number],
+        written_at: datetime,
+        value: Optional[Number],
+        deadband: Deadband,
+        now: datetime,
+        min_interval: int,
+        max_interval: int,
+    ) -> bool:
+        if written_value is None or value is None:
+            return True
+
+        if (written_value == 0) != (value == 0):
+            return True
+
+        elapsed = (now - written_at).total_seconds()
+
+        if elapsed < min_interval:
+            return False
+
+        if deadband.is_exceeded(written_value, value):
+            return True
+
+        return max_interval > 0 and elapsed >= max_interval
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from homeassistant.exceptions import HomeAssistantError
 
 
@@ -21,3 +23,35 @@ class AutoOffError(HomeAssistantError):
     def __init__(self, time: str, error_code: str):
         self.time = time
         self.error_code = error_code
+
+
+class DeviceUnavailableError(HomeAssistantError):
+    device_details: str
+
+    def __init__(self, device_details: str):
+        self.device_details = device_details
+
+
+class CommandExpiredError(HomeAssistantError):
+    deadline: datetime
+
+    def __init__(self, deadline: datetime):
+        self.deadline = deadline
+
+
+class DeadbandError(HomeAssistantError):
+    deadband: str
+
+    def __init__(self, deadband: str, error_code: str):
+        self.deadband = deadband
+        self.error_code = error_code
+
+
+class PollIntervalError(HomeAssistantError):
+    min_interval: int
+    max_interval: int
+
+    def __init__(self, min_interval: int, max_interval: int, error_code: str):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.error_code = error_code
@@ -46,6 +46,7 @@ class BaseEntity(Entity):
     entity: EntityData = None
     remove_dispatcher = None
     current_domain: str = None
+    last_state = None
 
     ha = None
     entity_manager = None
@@ -64,6 +65,7 @@ class BaseEntity(Entity):
         self.entity = entity
         self.remove_dispatcher = None
         self.current_domain = current_domain
+        self.last_state = entity.state
 
         self.ha = get_ha(self.hass, self.integration_name)
         self.entity_manager = self.ha.entity_manager
@@ -89,6 +91,11 @@ class BaseEntity(Entity):
         """Return the name of the node."""
         return self.entity.name
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is reachable."""
+        return self.entity.available
+
     @property
     def should_poll(self):
         """Return the polling state."""
@@ -101,8 +108,10 @@ class BaseEntity(Entity):
 
     async def async_added_to_hass(self):
         """Register callbacks."""
-        async_dispatcher_connect(
-            self.hass, SIGNALS[self.current_domain], self._schedule_immediate_update
+        signal = UPDATE_SIGNAL.format(self.integration_name, self.unique_id)
+
+        self.remove_dispatcher = async_dispatcher_connect(
+            self.hass, signal, self._schedule_immediate_update
         )
 
         await self.async_added_to_hass_local()
@@ -115,30 +124,17 @@ class BaseEntity(Entity):
         await self.async_will_remove_from_hass_local()
 
     @callback
-    def _schedule_immediate_update(self):
-        self.hass.async_create_task(self._async_schedule_immediate_update())
-
-    async def _async_schedule_immediate_update(self):
-        if self.entity_manager is None:
-            _LOGGER.debug(
-                f"Cannot update {self.current_domain} - Entity Manager is None | {self.name}"
-            )
-        else:
-            if self.entity is not None:
-                previous_state = self.entity.state
-
-                entity = self.entity_manager.get_entity(self.current_domain, self.name)
+    def _schedule_immediate_update(self, entity: EntityData):
+        if entity.disabled:
+            _LOGGER.debug(f"Skip updating {self.name}, Entity is disabled")
 
-                if entity is None:
-                    _LOGGER.debug(f"Skip updating {self.name}, Entity is None")
+        else:
+            previous_state = self.last_state
 
-                elif entity.disabled:
-                    _LOGGER.debug(f"Skip updating {self.name}, Entity is disabled")
+            self.entity = entity
+            self.last_state = entity.state
 
-                else:
-                    self.entity = entity
-                    if self.entity is not None:
-                        self._immediate_update(previous_state)
+            self._immediate_update(previous_state)
 
     async def async_added_to_hass_local(self):
         pass
@@ -147,4 +143,4 @@ class BaseEntity(Entity):
         pass
 
     def _immediate_update(self, previous_state: bool):
-        self.async_schedule_update_ha_state(True)
+        self.async_write_ha_state()
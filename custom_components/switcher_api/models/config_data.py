@@ -8,12 +8,42 @@ class ConfigData:
     ip_address: str
     device_id: str
     log_level: str
+    use_broadcast: bool
+    fallback_interval: int
+    min_poll_interval: int
+    max_poll_interval: int
+    diagnostic_sensors: bool
+    state_sensors: bool
+    power_deadband: str
+    current_deadband: str
+    min_write_interval: int
+    max_write_interval: int
+    schedules_interval: int
+    state_timeout: int
+    schedules_timeout: int
+    control_timeout: int
+    configuration_timeout: int
 
     def __init__(self):
         self.name = DEFAULT_NAME
         self.ip_address = ""
         self.device_id = ""
         self.auto_off = None
+        self.use_broadcast = False
+        self.fallback_interval = DEFAULT_FALLBACK_INTERVAL
+        self.min_poll_interval = DEFAULT_MIN_POLL_INTERVAL
+        self.max_poll_interval = DEFAULT_MAX_POLL_INTERVAL
+        self.diagnostic_sensors = False
+        self.state_sensors = False
+        self.power_deadband = DEFAULT_DEADBAND
+        self.current_deadband = DEFAULT_DEADBAND
+        self.min_write_interval = DEFAULT_MIN_WRITE_INTERVAL
+        self.max_write_interval = DEFAULT_MAX_WRITE_INTERVAL
+        self.schedules_interval = DEFAULT_SCHEDULES_INTERVAL
+        self.state_timeout = DEFAULT_STATE_TIMEOUT
+        self.schedules_timeout = DEFAULT_SCHEDULES_TIMEOUT
+        self.control_timeout = DEFAULT_CONTROL_TIMEOUT
+        self.configuration_timeout = DEFAULT_CONFIGURATION_TIMEOUT
 
         self.log_level = LOG_LEVEL_DEFAULT
 
@@ -23,6 +53,21 @@ class ConfigData:
             CONF_IP_ADDRESS: self.ip_address,
             CONF_DEVICE_ID: self.device_id,
             CONF_AUTO_OFF: self.auto_off,
+            CONF_USE_BROADCAST: self.use_broadcast,
+            CONF_FALLBACK_INTERVAL: self.fallback_interval,
+            CONF_MIN_POLL_INTERVAL: self.min_poll_interval,
+            CONF_MAX_POLL_INTERVAL: self.max_poll_interval,
+            CONF_DIAGNOSTIC_SENSORS: self.diagnostic_sensors,
+            CONF_STATE_SENSORS: self.state_sensors,
+            CONF_POWER_DEADBAND: self.power_deadband,
+            CONF_CURRENT_DEADBAND: self.current_deadband,
+            CONF_MIN_WRITE_INTERVAL: self.min_write_interval,
+            CONF_MAX_WRITE_INTERVAL: self.max_write_interval,
+            CONF_SCHEDULES_INTERVAL: self.schedules_interval,
+            CONF_STATE_TIMEOUT: self.state_timeout,
+            CONF_SCHEDULES_TIMEOUT: self.schedules_timeout,
+            CONF_CONTROL_TIMEOUT: self.control_timeout,
+            CONF_CONFIGURATION_TIMEOUT: self.configuration_timeout,
         }
 
         to_string = f"{obj}"
@@ -0,0 +1,17 @@
+from typing import Any, NamedTuple
+
+
+class ControlResult(NamedTuple):
+    """Outcome of the control command which reached the device.
+
+    Coalesced callers share it, sequence identifies the caller whose
+    command was sent.
+    """
+
+    sequence: int
+    action: bool
+    response: Any
+
+    @property
+    def successful(self) -> bool:
+        return self.response.successful
@@ -2,6 +2,23 @@ from ..helpers.const import *
 
 
 class EntityData:
+    __slots__ = (
+        "id",
+        "unique_id",
+        "name",
+        "state",
+        "attributes",
+        "icon",
+        "device_name",
+        "status",
+        "device_class",
+        "type",
+        "details",
+        "disabled",
+        "available",
+        "unit_of_measurement",
+    )
+
     id: str
     unique_id: str
     name: str
@@ -14,6 +31,8 @@ class EntityData:
     type: str
     details: dict
     disabled: bool
+    available: bool
+    unit_of_measurement: str
 
     def __init__(self):
         self.id = ""
@@ -28,6 +47,12 @@ class EntityData:
         self.type = ""
         self.details = {}
         self.disabled = False
+        self.available = True
+        self.unit_of_measurement = ""
+
+    @property
+    def fingerprint(self):
+        return self.state, self.icon, self.attributes, self.available
 
     def __repr__(self):
         obj = {
@@ -42,6 +67,8 @@ class EntityData:
             ENTITY_DEVICE_CLASS: self.device_class,
             ENTITY_TYPE: self.type,
             ENTITY_DISABLED: self.disabled,
+            ENTITY_AVAILABLE: self.available,
+            ENTITY_UNIT_OF_MEASUREMENT: self.unit_of_measurement,
         }
 
         to_string = f"{obj}"
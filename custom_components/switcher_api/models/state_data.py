@@ -0,0 +1,26 @@
+from typing import NamedTuple, Optional
+
+
+class StateData(NamedTuple):
+    """Immutable snapshot of the device state."""
+
+    state: Optional[str] = None
+    time_left: Optional[str] = None
+    time_on: Optional[str] = None
+    auto_shutdown: Optional[str] = None
+    power_consumption: Optional[int] = None
+    electric_current: Optional[float] = None
+
+    @staticmethod
+    def from_dict(obj: Optional[dict]):
+        if obj is None:
+            return StateData()
+
+        values = {key: obj.get(key) for key in StateData._fields if key in obj}
+
+        return StateData(**values)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key) if key in self._fields else None
+
+        return default if value is None else value
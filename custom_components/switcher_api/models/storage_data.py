@@ -1,41 +1,57 @@
 from typing import Dict, Optional
 
 
-class StorageIntegrationData:
-    generate_configuration_files: bool
+class StorageDeviceData:
+    state: dict
+    schedules: dict
+    saved: Optional[str]
 
     def __init__(self):
-        self.generate_configuration_files = False
+        self.state = {}
+        self.schedules = {}
+        self.saved = None
+
+    @staticmethod
+    def from_dict(obj: dict):
+        data = StorageDeviceData()
+
+        if obj is not None:
+            data.state = obj.get("state", {})
+            data.schedules = obj.get("schedules", {})
+            data.saved = obj.get("saved")
+
+        return data
+
+    def to_dict(self):
+        obj = {"state": self.state, "schedules": self.schedules, "saved": self.saved}
+
+        return obj
 
 
 class StorageData:
-    key: Optional[str]
-    integrations: Dict[str, StorageIntegrationData]
+    devices: Dict[str, StorageDeviceData]
 
     def __init__(self):
-        self.key = None
-        self.integrations = {}
+        self.devices = {}
 
     @staticmethod
     def from_dict(obj: dict):
         data = StorageData()
 
         if obj is not None:
-            data.key = obj.get("key")
+            devices = obj.get("devices", {})
+
+            for entry_id in devices:
+                data.devices[entry_id] = StorageDeviceData.from_dict(devices[entry_id])
 
         return data
 
     def to_dict(self):
-        integrations = {}
-        for integration_key in self.integrations:
-            current_integration = self.integrations[integration_key]
-            integration = {
-                "CONF_GENERATE_CONFIG_FILES": current_integration.generate_configuration_files
-            }
-
-            integrations[integration_key] = integration
+        devices = {}
+        for entry_id in self.devices:
+            devices[entry_id] = self.devices[entry_id].to_dict()
 
-        obj = {"key": self.key, "integrations": integrations}
+        obj = {"devices": devices}
 
         return obj
 
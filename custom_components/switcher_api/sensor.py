@@ -48,12 +48,12 @@ class Sensor(BaseEntity):
     @property
     def device_class(self) -> Optional[str]:
         """Return the type of the node."""
-        return self.entity.device_class
+        return self.entity.device_class or None
 
     @property
     def unit_of_measurement(self) -> Optional[str]:
         """Return the type of the node."""
-        return "w" if self.entity.device_class == "power" else "A"
+        return self.entity.unit_of_measurement or None
 
     async def async_added_to_hass_local(self):
         _LOGGER.info(f"Added new {self.name}")
@@ -57,15 +57,11 @@ class Switch(SwitchEntity, BaseEntity):
         if self.entity_type == SWITCH_MAIN:
             await self.api.turn_on()
 
-        self.ha.async_update()
-
     async def async_turn_off(self, **kwargs):
         """Turn device off."""
         if self.entity_type == SWITCH_MAIN:
             await self.api.turn_off()
 
-        self.ha.async_update()
-
     def turn_on(self, **kwargs) -> None:
         pass
 